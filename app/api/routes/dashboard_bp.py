@@ -25,25 +25,19 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from app.core.config import Config
-from app.core.utils.session_utils import _validate_session, require_auth
+from app.core.utils.session_utils import _validate_session, get_user_key, require_auth
 
 # Blueprint for dashboard routes
 dashboard_bp = Blueprint("dashboard_bp", __name__)
 logger = logging.getLogger(__name__)
 
 # Initialize rate limiter
-# TODO @vakesz: Configure rate limiter to use Redis storage backend for production
+# Storage backend (memory or Redis) comes from RATELIMIT_STORAGE_URI at init_app time
 limiter = Limiter(key_func=get_remote_address)
 
 # --- Helper Functions ---
 
 
-def _get_user_key() -> str | None:
-    """Get the user key from session for identification."""
-    user = session.get("user") or {}
-    return user.get("preferred_username") or user.get("name")
-
-
 def _render_dashboard_context(**overrides: Any) -> dict[str, Any]:
     """Gather default context for dashboard rendering.
 
@@ -54,7 +48,7 @@ def _render_dashboard_context(**overrides: Any) -> dict[str, Any]:
         Dictionary containing all template context variables
     """
     user = session.get("user", {})
-    key = _get_user_key()
+    key = get_user_key()
     now = datetime.now(timezone.utc)
 
     # Fetch data
@@ -62,8 +56,7 @@ def _render_dashboard_context(**overrides: Any) -> dict[str, Any]:
     available_locations = current_app.database_manager.get_available_locations()
     available_keywords = current_app.database_manager.get_all_keywords()
     user_notifications = current_app.database_manager.get_user_notifications(key, limit=10)
-    unread_count = current_app.database_manager.get_user_notification_count(key, unread_only=True)
-    total_count = current_app.database_manager.get_user_notification_count(key, unread_only=False)
+    unread_count, total_count = current_app.database_manager.get_user_notification_counts(key)
     posts = current_app.database_manager.get_latest_posts(limit=10)
 
     # Calculate derived values
@@ -106,7 +99,7 @@ def _json_response(func: Callable, *args: Any, **kwargs: Any) -> Response | tupl
             "API error: %s | endpoint=%s | user=%s",
             e,
             request.endpoint,
-            _get_user_key(),
+            get_user_key(),
         )
         return jsonify({"error": str(e)}), 500
 
@@ -122,7 +115,7 @@ def dashboard() -> str:
         context = _render_dashboard_context()
         return render_template("dashboard.html", **context)
     except (AttributeError, KeyError, ValueError, RuntimeError) as e:
-        logger.exception("Dashboard error: %s | user=%s", e, _get_user_key())
+        logger.exception("Dashboard error: %s | user=%s", e, get_user_key())
         flash(f"Error loading dashboard: {e}", "error")
 
         # Provide fallback context with empty data
@@ -149,7 +142,7 @@ def refresh_posts() -> Response:
         current_app.polling_service.manual_poll()
         flash("Refreshing posts...", "info")
     except (RuntimeError, ValueError, OSError) as e:
-        logger.exception("Manual refresh failed: %s | user=%s", e, _get_user_key())
+        logger.exception("Manual refresh failed: %s | user=%s", e, get_user_key())
         flash(f"Refresh failed: {e}", "error")
     return redirect(url_for("dashboard_bp.dashboard"))
 
@@ -160,7 +153,7 @@ def mark_notifications_read() -> Response | tuple:
     """Mark all notifications as read for the authenticated user."""
 
     def action() -> dict[str, Any]:
-        user_key = _get_user_key()
+        user_key = get_user_key()
         if not user_key:
             raise ValueError("User key not found in session")
 
@@ -182,15 +175,14 @@ def get_notification_status() -> Response | tuple:
     """Fetch current notification summary for the authenticated user."""
 
     def action() -> dict[str, Any]:
-        user_key = _get_user_key()
+        user_key = get_user_key()
         if not user_key:
             raise ValueError("User key not found in session")
 
         logger.debug("Fetching notification status for user: %s", user_key)
         # Fetch user-specific notifications and counts
         notifications = current_app.database_manager.get_user_notifications(user_key, limit=10, unread_only=False)
-        unread_count = current_app.database_manager.get_user_notification_count(user_key, unread_only=True)
-        total_count = current_app.database_manager.get_user_notification_count(user_key, unread_only=False)
+        unread_count, total_count = current_app.database_manager.get_user_notification_counts(user_key)
         push_enabled = current_app.database_manager.has_push_subscription(user_key)
 
         summary = {
@@ -251,9 +243,9 @@ def user_photo() -> Response:
             return send_file(io.BytesIO(resp.content), mimetype=resp.headers.get("Content-Type"))
         if resp.status_code == 401:
             session.clear()
-        logger.warning("User photo fetch status %s | user=%s", resp.status_code, _get_user_key())
+        logger.warning("User photo fetch status %s | user=%s", resp.status_code, get_user_key())
     except (requests.RequestException, OSError) as e:
-        logger.warning("Failed to fetch user photo: %s | user=%s", e, _get_user_key())
+        logger.warning("Failed to fetch user photo: %s | user=%s", e, get_user_key())
     return send_from_directory(current_app.static_folder + "/img/user", "default_profile.webp")
 
 
@@ -263,7 +255,7 @@ def get_notification_settings() -> Response | tuple:
     """Get current notification settings."""
 
     def action() -> dict[str, Any]:
-        key = _get_user_key()
+        key = get_user_key()
         return current_app.notification_service.get_settings(key)
 
     return _json_response(action)
@@ -275,7 +267,7 @@ def save_notification_settings() -> Response | tuple:
     """Save new notification settings."""
 
     def action() -> dict[str, bool]:
-        key = _get_user_key()
+        key = get_user_key()
         data = request.get_json()
         if not data:
             raise ValueError("No settings provided")
@@ -58,13 +58,30 @@ class Config:
 
     # Auth token lifetime in days for cleanup
     AUTH_TOKEN_TTL_DAYS = int(os.environ.get("AUTH_TOKEN_TTL_DAYS", "30"))
+    # Hour of day (scheduler local time) for the daily cleanup of expired data
+    CLEANUP_HOUR = int(os.environ.get("CLEANUP_HOUR", "3"))
 
     # Push notification settings
     PUSH_TTL = int(os.environ.get("PUSH_TTL", "86400"))  # seconds
+    PUSH_FANOUT_CONCURRENCY = int(os.environ.get("PUSH_FANOUT_CONCURRENCY", "64"))  # concurrent push deliveries
+    # Upper bound on push messages queued per second across all deliveries; 0 disables throttling
+    PUSH_THROTTLE_PER_SEC = float(os.environ.get("PUSH_THROTTLE_PER_SEC", "0"))
+    # Seconds a user's settings stay cached in-process; only other processes miss an update, so
+    # leave at 0 unless the app runs as a single process
+    SETTINGS_CACHE_TTL = int(os.environ.get("SETTINGS_CACHE_TTL", "0"))
+    # Seconds an existing push subscription is remembered in-process; same caveat as above
+    SUBSCRIPTION_CACHE_TTL = int(os.environ.get("SUBSCRIPTION_CACHE_TTL", "0"))
 
     # Database
     APP_DATABASE_PATH = os.environ.get("APP_DATABASE_PATH", "db/posts.db")
     DB_TIMEOUT = int(os.environ.get("DB_TIMEOUT", "30"))
+    # Log EXPLAIN QUERY PLAN for every read and warn on full table scans (debugging aid)
+    DB_EXPLAIN_QUERIES = os.environ.get("DB_EXPLAIN_QUERIES", "false").lower() in ("1", "true", "yes")
+
+    # Rate limit counters; use Redis (e.g. redis://localhost:6379/0) so limits hold across worker processes
+    RATELIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_STORAGE_URL", "memory://")
+    # Rolling windows avoid the double burst fixed windows allow at window boundaries
+    RATELIMIT_STRATEGY = os.environ.get("RATE_LIMIT_STRATEGY", "moving-window")
 
     # VAPID keys for Web Push
     PUSH_VAPID_PUBLIC_KEY = os.environ.get("PUSH_VAPID_PUBLIC_KEY")
@@ -123,8 +140,18 @@ class Config:
             raise SystemExit("POLLING_MAX_BACKOFF must be greater than POLLING_INTERVAL_MINUTES")
         if cls.AUTH_TOKEN_TTL_DAYS < 1:
             raise SystemExit("AUTH_TOKEN_TTL_DAYS must be at least 1 day")
+        if not 0 <= cls.CLEANUP_HOUR <= 23:
+            raise SystemExit("CLEANUP_HOUR must be between 0 and 23")
         if cls.PUSH_TTL < 0:
             raise SystemExit("PUSH_TTL must be non-negative")
+        if cls.PUSH_FANOUT_CONCURRENCY < 1:
+            raise SystemExit("PUSH_FANOUT_CONCURRENCY must be at least 1")
+        if cls.PUSH_THROTTLE_PER_SEC < 0:
+            raise SystemExit("PUSH_THROTTLE_PER_SEC must be non-negative")
+        if cls.SETTINGS_CACHE_TTL < 0:
+            raise SystemExit("SETTINGS_CACHE_TTL must be non-negative")
+        if cls.SUBSCRIPTION_CACHE_TTL < 0:
+            raise SystemExit("SUBSCRIPTION_CACHE_TTL must be non-negative")
 
 
 class DevelopmentConfig(Config):
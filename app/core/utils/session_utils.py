@@ -7,7 +7,7 @@ from functools import wraps
 from threading import Lock
 
 from cryptography.fernet import Fernet, InvalidToken
-from flask import current_app, redirect, session, url_for
+from flask import current_app, g, redirect, session, url_for
 
 from app.core.config import Config
 
@@ -70,6 +70,14 @@ def _has_valid_user() -> bool:
     return bool(session.get("user"))
 
 
+def get_user_key() -> str | None:
+    """Return the signed-in user's key, resolved once per request."""
+    if "user_key" not in g:
+        user = session.get("user") or {}
+        g.user_key = user.get("preferred_username") or user.get("name")
+    return g.user_key
+
+
 def _redirect_to_login():
     """Redirect helper for unauthenticated access."""
     return redirect(url_for("auth_bp.login"))
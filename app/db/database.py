@@ -4,6 +4,8 @@ import json
 import logging
 import sqlite3
 import threading
+import time
+from collections.abc import Iterator
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Any
@@ -103,6 +105,28 @@ class DatabaseManager:
         ),
     ]
 
+    # Existing push subscriptions remembered at most; see Config.SUBSCRIPTION_CACHE_TTL
+    _SUBSCRIPTION_CACHE_SIZE = 4096
+    # Seconds subscription last_used updates are buffered before being written together
+    _LAST_USED_FLUSH_INTERVAL = 10
+
+    # Stay below SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+    _MAX_SQL_PARAMS = 900
+
+    # User feed queries, one fixed statement per variant
+    _SQL_FEED = (
+        "SELECT n.*, un.is_read, un.read_at, un.created_at as user_notification_created_at"
+        " FROM notifications n JOIN user_notifications un ON un.notification_id = n.id"
+        " WHERE un.user_id = ? AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))"
+        " ORDER BY n.created_at DESC LIMIT ?"
+    )
+    _SQL_FEED_UNREAD = (
+        "SELECT n.*, un.is_read, un.read_at, un.created_at as user_notification_created_at"
+        " FROM notifications n JOIN user_notifications un ON un.notification_id = n.id"
+        " WHERE un.user_id = ? AND un.is_read = 0 AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))"
+        " ORDER BY n.created_at DESC LIMIT ?"
+    )
+
     def __init__(self, db_path: str = "notifications.db") -> None:
         """
         Initialize the DatabaseManager.
@@ -111,16 +135,53 @@ class DatabaseManager:
             db_path: Path to the SQLite database file.
         """
         self.db_path = db_path
+        # Serializes writers (transactions) only; reads run on per-thread connections
         self._lock = threading.RLock()
-        self._conn = self._create_connection()
+        # Thread ident -> that thread's connection, so every connection can be found and closed
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        # (endpoint, user_key) -> expiry on the monotonic clock for subscriptions known to exist.
+        # Browsers re-post their subscription on every page load; any change to the table clears it.
+        self._known_subscriptions: dict[tuple[str, str | None], float] = {}
+        # endpoint -> last-used timestamp not yet written; flushed in one batch every few seconds
+        self._last_used_buffer: dict[str, str] = {}
+        self._last_used_lock = threading.Lock()
+        self._last_used_flushed = time.monotonic()
         self._initialize_db()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush_subscription_last_used()
         self._close_connection()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Return the calling thread's connection, opening it on first use.
+
+        With WAL journaling, readers on separate connections neither block each
+        other nor the writer, so read paths no longer need ``self._lock``.
+        """
+        ident = threading.get_ident()
+        conn = self._connections.get(ident)
+        if conn is None:
+            conn = self._create_connection()
+            with self._connections_lock:
+                self._close_dead_thread_connections()
+                self._connections[ident] = conn
+        return conn
+
+    def _close_dead_thread_connections(self) -> None:
+        """Close connections left behind by threads that have exited. Caller holds ``_connections_lock``."""
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in self._connections.keys() - alive:
+            try:
+                self._connections.pop(ident).close()
+            except sqlite3.Error as e:
+                logger.error("Error closing database connection: %s", e)
+
     def _create_connection(self) -> sqlite3.Connection:
         """
         Create and configure a new database connection.
@@ -140,19 +201,28 @@ class DatabaseManager:
             )
             conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL stays consistent with NORMAL sync (only the last commits may roll back on power loss)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            # Page cache is per connection and connections are per thread, so keep it modest (16 MiB)
+            conn.execute("PRAGMA cache_size = -16384")
             return conn
         except sqlite3.Error as e:
             logger.error("Connection error: %s", e)
             raise DatabaseError(f"Connection error: {e}") from e
 
     def _close_connection(self) -> None:
-        """Close the database connection."""
-        if hasattr(self, "_conn") and self._conn:
+        """Close the database connections of all threads; each reopens its own on next use."""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
             try:
-                self._conn.close()
+                conn.close()
             except sqlite3.Error as e:
                 logger.error("Error closing database connection: %s", e)
-            self._conn = None
 
     @contextmanager
     def _transaction(self) -> sqlite3.Connection:
@@ -167,23 +237,24 @@ class DatabaseManager:
             DatabaseError: If an error occurs during transaction.
         """
         with self._lock:
-            self._conn.execute("BEGIN")
+            conn = self._conn
+            conn.execute("BEGIN")
             success = False
             try:
-                yield self._conn
+                yield conn
                 success = True
             except sqlite3.Error as e:
                 logger.error("Transaction failed: %s", e)
                 # immediate rollback on error
                 try:
-                    self._conn.rollback()
+                    conn.rollback()
                 except sqlite3.Error as rollback_err:
                     logger.error("Rollback failed: %s", rollback_err)
                     raise DatabaseError(f"Rollback failed: {rollback_err}") from rollback_err
                 raise DatabaseError(f"Transaction failed: {e}") from e
             finally:
                 if success:
-                    self._conn.commit()
+                    conn.commit()
 
     def _initialize_db(self) -> None:
         """
@@ -201,10 +272,13 @@ class DatabaseManager:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_expires ON notifications(expires_at)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_created ON notifications(created_at)")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_user_notifications_user_read ON user_notifications(user_id, is_read)"
+                "CREATE INDEX IF NOT EXISTS idx_user_notifications_notification ON user_notifications(notification_id)"
             )
+            # (user_id, is_read) is a prefix of the covering index below, which serves the same lookups
+            conn.execute("DROP INDEX IF EXISTS idx_user_notifications_user_read")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_user_notifications_notification ON user_notifications(notification_id)"
+                "CREATE INDEX IF NOT EXISTS idx_user_notifications_uid_read_nid "
+                "ON user_notifications(user_id, is_read, notification_id)"
             )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_push_subscriptions_user_device "
@@ -213,6 +287,43 @@ class DatabaseManager:
 
         # Run migration after schema is set up
         self._migrate_notifications_schema()
+        self._analyze_if_needed()
+
+    def _analyze_if_needed(self) -> None:
+        """Collect planner statistics once, so index choices don't rely on defaults."""
+        try:
+            has_stats = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone()
+            if not has_stats:
+                self._conn.execute("ANALYZE")
+        except sqlite3.Error as e:
+            logger.warning("ANALYZE failed: %s", e)
+
+    def optimize(self) -> None:
+        """Refresh planner statistics for tables whose usage changed since the last run."""
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.warning("PRAGMA optimize failed: %s", e)
+
+    def _query_plan(self, sql: str, params: tuple = ()) -> list[str]:
+        """Return the detail lines of ``EXPLAIN QUERY PLAN`` for a statement."""
+        return [row["detail"] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def _explain(self, sql: str, params: tuple) -> None:
+        """Log the query plan and warn when a statement falls back to a full table scan."""
+        try:
+            plan = self._query_plan(sql, params)
+        except sqlite3.Error as e:
+            logger.debug("EXPLAIN QUERY PLAN failed for SQL: %s: %s", sql, e)
+            return
+        scans = [detail for detail in plan if detail.startswith("SCAN") and "INDEX" not in detail]
+        if scans:
+            logger.warning("Query plan uses a full table scan (%s). Query: %s", "; ".join(scans), sql)
+        else:
+            logger.debug("Query plan: %s. Query: %s", "; ".join(plan), sql)
 
     def _ensure_column(self, conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
         cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
@@ -295,7 +406,7 @@ class DatabaseManager:
                 return False
 
             utc_time_now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-            created_at = existing.created_at if existing else utc_time_now
+            created_at = existing.created_at.strftime("%Y-%m-%d %H:%M:%S") if existing else utc_time_now
 
             self._upsert_post(post, created_at, utc_time_now, conn)
 
@@ -311,22 +422,63 @@ class DatabaseManager:
         """
         updated: list[Post] = []
         with self._transaction() as conn:
+            existing = self._get_post_fingerprints([post.id for post in posts], conn)
+            utc_time_now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
             for post in posts:
-                existing = self.get_post(post.id)
+                known = existing.get(post.id)
 
                 # Skip if exists and neither title nor content changed
-                if existing and existing.title == post.title and existing.content == post.content:
+                if known and known[0] == post.title and known[1] == post.content:
                     continue
 
-                utc_time_now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                created_at = existing.created_at if existing else utc_time_now
+                created_at = known[2] if known and known[2] else utc_time_now
 
                 self._upsert_post(post, created_at, utc_time_now, conn)
                 self._add_post_locations(post.id, [post.location], conn)
+                existing[post.id] = (post.title, post.content, created_at)
                 updated.append(post)
 
         return updated
 
+    def _get_post_fingerprints(self, post_ids: list[str], conn: sqlite3.Connection) -> dict[str, tuple[str, str, str]]:
+        """
+        Look up stored posts by ID in as few queries as possible.
+
+        Args:
+            post_ids: Post identifiers to look up.
+            conn: Active sqlite3.Connection.
+
+        Returns:
+            Dict[str, Tuple[str, str, str]]: Post ID to (title, content, created_at) for posts that exist.
+        """
+        found: dict[str, tuple[str, str, str]] = {}
+        unique_ids = list(dict.fromkeys(post_ids))
+        for start in range(0, len(unique_ids), self._MAX_SQL_PARAMS):
+            chunk = unique_ids[start : start + self._MAX_SQL_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT id, title, content, created_at FROM posts WHERE id IN ({placeholders})", tuple(chunk)
+            )
+            found.update({row["id"]: (row["title"], row["content"], row["created_at"]) for row in rows})
+        return found
+
+    def get_recent_post_fingerprints(self, limit: int = 500) -> dict[str, tuple[str, str]]:
+        """
+        Fetch the title and content of the most recently stored posts.
+
+        Args:
+            limit: Maximum number of posts to return.
+
+        Returns:
+            Dict[str, Tuple[str, str]]: Post ID to (title, content).
+        """
+        return {
+            row["id"]: (row["title"], row["content"])
+            for row in self._iter_rows(
+                "SELECT id, title, content FROM posts ORDER BY created_at DESC LIMIT ?", (limit,)
+            )
+        }
+
     def get_post(self, post_id: str) -> Post | None:
         """
         Retrieve a post by its unique ID.
@@ -341,7 +493,7 @@ class DatabaseManager:
 
         if not row:
             return None
-        return Post.from_database_row(dict(row))
+        return Post.from_database_row_trusted(dict(row))
 
     def get_latest_posts(self, limit: int = 10) -> list[Post]:
         """
@@ -353,8 +505,9 @@ class DatabaseManager:
         Returns:
             List[Post]: List of retrieved posts.
         """
-        rows = self._fetch_all("SELECT * FROM posts ORDER BY publish_date DESC LIMIT ?", (limit,))
-        return [Post.from_database_row(dict(r)) for r in rows]
+        return Post.from_database_rows_trusted(
+            self._iter_rows("SELECT * FROM posts ORDER BY publish_date DESC LIMIT ?", (limit,))
+        )
 
     def add_notification(self, notif: Notification) -> int | None:
         """
@@ -366,22 +519,37 @@ class DatabaseManager:
         Returns:
             Optional[int]: The notification ID if insert succeeds, None otherwise.
         """
+        return self.add_notifications_bulk([notif])[0]
+
+    def add_notifications_bulk(self, notifs: list[Notification]) -> list[int]:
+        """
+        Create many notification entries in a single transaction.
+
+        Args:
+            notifs: Notification model instances.
+
+        Returns:
+            List[int]: The new notification IDs, in the order of ``notifs``.
+        """
         sql = (
             "INSERT INTO notifications ("
             "post_id, title, message, image_url, created_at, is_urgent, expires_at)"
             " VALUES (?, ?, ?, ?, ?, ?, ?)"
         )
-        params = (
-            notif.post_id,
-            notif.title,
-            notif.message,
-            notif.image_url,
-            notif.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            notif.is_urgent,
-            (notif.expires_at.strftime("%Y-%m-%d %H:%M:%S") if notif.expires_at else None),
-        )
-        cursor = self._execute(sql, params)
-        return cursor.lastrowid if cursor else None
+        ids = []
+        with self._transaction() as conn:
+            for notif in notifs:
+                params = (
+                    notif.post_id,
+                    notif.title,
+                    notif.message,
+                    notif.image_url,
+                    notif.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    notif.is_urgent,
+                    (notif.expires_at.strftime("%Y-%m-%d %H:%M:%S") if notif.expires_at else None),
+                )
+                ids.append(conn.execute(sql, params).lastrowid)
+        return ids
 
     def get_notifications(self, user_id: str, limit: int = 10, include_expired: bool = False) -> list[dict[str, Any]]:
         """
@@ -503,32 +671,51 @@ class DatabaseManager:
 
             device_id = hashlib.md5(info["endpoint"].encode()).hexdigest()[:16]
 
-        return bool(
-            self._execute(
-                "INSERT OR REPLACE INTO push_subscriptions"
-                " (endpoint, auth, p256dh, user_key, device_id, created_at, updated_at, is_active)"
-                " VALUES (?, ?, ?, ?, ?, ?, ?, 1)",
-                (
-                    info["endpoint"],
-                    info["keys"]["auth"],
-                    info["keys"]["p256dh"],
-                    user_key,
-                    device_id,
-                    now,
-                    now,
-                ),
-            )
+        # Replacing the row may move the endpoint to another user
+        self._known_subscriptions.clear()
+        self._execute(
+            "INSERT OR REPLACE INTO push_subscriptions"
+            " (endpoint, auth, p256dh, user_key, device_id, created_at, updated_at, is_active)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, 1)",
+            (
+                info["endpoint"],
+                info["keys"]["auth"],
+                info["keys"]["p256dh"],
+                user_key,
+                device_id,
+                now,
+                now,
+            ),
         )
+        self._remember_subscription((info["endpoint"], user_key))
+        return True
 
     def push_subscription_exists(self, endpoint: str, user_key: str | None = None) -> bool:
         """Check if a push subscription already exists for the given endpoint and user."""
+        key = (endpoint, user_key)
+        expiry = self._known_subscriptions.get(key)
+        if expiry is not None and expiry > time.monotonic():
+            return True
+
         params = [endpoint]
         query = "SELECT 1 FROM push_subscriptions WHERE endpoint = ?"
         if user_key is not None:
             query += " AND user_key = ?"
             params.append(user_key)
         row = self._fetch_one(query + " LIMIT 1", tuple(params))
-        return row is not None
+        if row is None:
+            return False
+
+        self._remember_subscription(key)
+        return True
+
+    def _remember_subscription(self, key: tuple[str, str | None]) -> None:
+        """Cache that the (endpoint, user_key) subscription exists, if the cache is enabled."""
+        if Config.SUBSCRIPTION_CACHE_TTL <= 0:
+            return
+        if len(self._known_subscriptions) >= self._SUBSCRIPTION_CACHE_SIZE:
+            self._known_subscriptions.clear()
+        self._known_subscriptions[key] = time.monotonic() + Config.SUBSCRIPTION_CACHE_TTL
 
     def remove_push_subscription(
         self,
@@ -556,39 +743,62 @@ class DatabaseManager:
 
         if user_key and device_id:
             # Remove specific device subscription for user (preferred path)
-            return bool(
-                self._execute(
-                    "DELETE FROM push_subscriptions WHERE endpoint = ? AND user_key = ? AND device_id = ?",
-                    (info["endpoint"], user_key, device_id),
-                )
-            )
-        if device_id:
+            query = "DELETE FROM push_subscriptions WHERE endpoint = ? AND user_key = ? AND device_id = ?"
+            params: tuple = (info["endpoint"], user_key, device_id)
+        elif device_id:
             # Remove by device_id and endpoint (fallback)
-            return bool(
-                self._execute(
-                    "DELETE FROM push_subscriptions WHERE endpoint = ? AND device_id = ?",
-                    (info["endpoint"], device_id),
-                )
-            )
-        # Endpoint-only removal (legacy fallback - logs warning)
-        logger.warning(
-            "Removing push subscription by endpoint only. Consider providing device_id for better multi-device support."
-        )
-        return bool(
-            self._execute(
-                "DELETE FROM push_subscriptions WHERE endpoint = ?",
-                (info["endpoint"],),
+            query = "DELETE FROM push_subscriptions WHERE endpoint = ? AND device_id = ?"
+            params = (info["endpoint"], device_id)
+        else:
+            # Endpoint-only removal (legacy fallback - logs warning)
+            logger.warning(
+                "Removing push subscription by endpoint only. "
+                "Consider providing device_id for better multi-device support."
             )
-        )
+            query = "DELETE FROM push_subscriptions WHERE endpoint = ?"
+            params = (info["endpoint"],)
+
+        try:
+            return bool(self._execute(query, params))
+        finally:
+            # Cleared once the row is gone, so a lookup racing the delete cannot keep it cached
+            self._known_subscriptions.clear()
 
     def update_subscription_last_used(self, endpoint: str) -> bool:
-        """Update the last_used timestamp for a push subscription."""
-        return bool(
-            self._execute(
-                "UPDATE push_subscriptions SET last_used = CURRENT_TIMESTAMP WHERE endpoint = ?",
-                (endpoint,),
+        """
+        Record that a push subscription was just used.
+
+        The timestamp is buffered and written together with other pending updates at most
+        every ``_LAST_USED_FLUSH_INTERVAL`` seconds (or on ``flush_subscription_last_used``).
+        """
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._last_used_lock:
+            self._last_used_buffer[endpoint] = now
+            due = time.monotonic() - self._last_used_flushed >= self._LAST_USED_FLUSH_INTERVAL
+        if due:
+            self.flush_subscription_last_used()
+        return True
+
+    def flush_subscription_last_used(self) -> int:
+        """
+        Write all buffered subscription last_used timestamps in one transaction.
+
+        Returns:
+            int: Number of endpoints written.
+        """
+        with self._last_used_lock:
+            pending = self._last_used_buffer
+            self._last_used_buffer = {}
+            self._last_used_flushed = time.monotonic()
+        if not pending:
+            return 0
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE push_subscriptions SET last_used = ? WHERE endpoint = ?",
+                ((used_at, endpoint) for endpoint, used_at in pending.items()),
             )
-        )
+        return len(pending)
 
     def has_push_subscription(self, user_key: str) -> bool:
         """Check if the given user has an active push subscription."""
@@ -671,6 +881,18 @@ class DatabaseManager:
         )
         return [r["keyword"] for r in rows]
 
+    def get_all_user_keywords(self) -> dict[str, list[str]]:
+        """
+        Retrieve the keywords of every user in one query.
+
+        Returns:
+            Dict[str, List[str]]: Mapping user_key to keywords; users without keywords are omitted.
+        """
+        keywords: dict[str, list[str]] = {}
+        for row in self._iter_rows("SELECT user_key, keyword FROM notification_keywords"):
+            keywords.setdefault(row["user_key"], []).append(row["keyword"])
+        return keywords
+
     def add_global_keywords(self, keywords: list[str]) -> None:
         """Add global keywords to the database."""
         if not keywords:
@@ -781,6 +1003,73 @@ class DatabaseManager:
             for r in rows
         ]
 
+    def get_subscribed_user_keys(self) -> list[str]:
+        """
+        Get the distinct users that have at least one active push subscription.
+
+        Returns:
+            List[str]: User keys, without loading the subscriptions themselves.
+        """
+        rows = self._fetch_all(
+            "SELECT DISTINCT user_key FROM push_subscriptions WHERE is_active = 1 AND user_key IS NOT NULL"
+        )
+        return [r["user_key"] for r in rows]
+
+    # Unreadable settings JSON counts as "push enabled", matching the service's fallback to defaults.
+    _SQL_ELIGIBLE_SUBSCRIPTIONS = """
+        SELECT ps.endpoint, ps.auth, ps.p256dh, ps.user_key, ps.device_id
+        FROM push_subscriptions ps
+        LEFT JOIN notification_settings ns ON ns.user_key = ps.user_key
+        WHERE ps.is_active = 1 AND ps.user_key IS NOT NULL
+          AND (ns.settings IS NULL OR NOT json_valid(ns.settings)
+               OR coalesce(json_extract(ns.settings, '$.pushNotifications'), 1) != 0)
+    """
+
+    def iter_eligible_push_subscriptions(
+        self, user_keys: list[str] | None, urgent: bool = False, chunk_size: int = 1000
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Stream active push subscriptions whose owners have not turned push notifications off.
+
+        Rows are pulled from the cursor in lists of at most ``chunk_size`` as the caller
+        consumes them, so an urgent broadcast never holds every subscription in memory at once.
+
+        Args:
+            user_keys: Users to get subscriptions for. If None or empty, yields all eligible subscriptions
+                      only when urgent=True, otherwise yields nothing.
+            urgent: If True, allows returning all subscriptions when user_keys is empty.
+            chunk_size: Maximum number of subscriptions per yielded list.
+        """
+        if not user_keys:
+            if not urgent:
+                return
+            key_chunks: list[list[str]] = [[]]
+        else:
+            key_chunks = [
+                user_keys[start : start + self._MAX_SQL_PARAMS]
+                for start in range(0, len(user_keys), self._MAX_SQL_PARAMS)
+            ]
+
+        chunk: list[dict[str, Any]] = []
+        for keys in key_chunks:
+            query = self._SQL_ELIGIBLE_SUBSCRIPTIONS
+            if keys:
+                query += f" AND ps.user_key IN ({','.join('?' * len(keys))})"
+            for r in self._iter_rows(query, tuple(keys), batch=chunk_size):
+                chunk.append(
+                    {
+                        "endpoint": r["endpoint"],
+                        "keys": {"auth": r["auth"], "p256dh": r["p256dh"]},
+                        "user_key": r["user_key"],
+                        "device_id": r["device_id"],
+                    }
+                )
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
     def add_user_notification(self, user_id: str, notification_id: int) -> bool:
         """
         Create a user notification entry for a specific user and notification.
@@ -809,16 +1098,27 @@ class DatabaseManager:
         Returns:
             bool: True if all inserts succeed, False otherwise.
         """
-        if not user_ids:
+        return self.add_user_notifications_multi([(notification_id, user_id) for user_id in user_ids])
+
+    def add_user_notifications_multi(self, pairs: list[tuple[int, str]]) -> bool:
+        """
+        Create user notification entries for many notifications in one transaction.
+
+        Args:
+            pairs: ``(notification_id, user_id)`` tuples, possibly spanning several notifications.
+
+        Returns:
+            bool: True if all inserts succeed, False otherwise.
+        """
+        if not pairs:
             return True
 
         with self._transaction() as conn:
-            for user_id in user_ids:
-                conn.execute(
-                    "INSERT INTO user_notifications (user_id, notification_id, is_read, created_at) "
-                    "VALUES (?, ?, 0, CURRENT_TIMESTAMP)",
-                    (user_id, notification_id),
-                )
+            conn.executemany(
+                "INSERT INTO user_notifications (user_id, notification_id, is_read, created_at) "
+                "VALUES (?, ?, 0, CURRENT_TIMESTAMP)",
+                ((user_id, notification_id) for notification_id, user_id in pairs),
+            )
         return True
 
     def mark_user_notification_read(self, user_id: str, notification_id: int) -> bool:
@@ -865,23 +1165,8 @@ class DatabaseManager:
         Returns:
             List[Dict[str, Any]]: List of notifications with read status.
         """
-        query = """
-            SELECT n.*, un.is_read, un.read_at, un.created_at as user_notification_created_at
-            FROM notifications n
-            JOIN user_notifications un ON un.notification_id = n.id
-            WHERE un.user_id = ?
-        """
-        params = [user_id]
-
-        if unread_only:
-            query += " AND un.is_read = 0"
-
-        query += " AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))"
-        query += " ORDER BY n.created_at DESC LIMIT ?"
-        params.append(limit)
-
-        rows = self._fetch_all(query, tuple(params))
-        return [dict(row) for row in rows]
+        sql = self._SQL_FEED_UNREAD if unread_only else self._SQL_FEED
+        return [dict(row) for row in self._iter_rows(sql, (user_id, limit))]
 
     def get_user_notification_count(self, user_id: str, unread_only: bool = True) -> int:
         """
@@ -894,22 +1179,49 @@ class DatabaseManager:
         Returns:
             int: Number of notifications matching criteria.
         """
-        query = """
-            SELECT COUNT(*)
-            FROM notifications n
-            JOIN user_notifications un ON un.notification_id = n.id
-            WHERE un.user_id = ?
-        """
-        params = [user_id]
+        # Served from the covering (user_id, is_read, notification_id) index; the
+        # notifications table is only probed by primary key for the expiry check.
+        query = "SELECT COUNT(*) FROM user_notifications un WHERE un.user_id = ?"
 
         if unread_only:
             query += " AND un.is_read = 0"
 
-        query += " AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))"
+        query += """
+            AND EXISTS (
+                SELECT 1 FROM notifications n
+                WHERE n.id = un.notification_id
+                AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))
+            )
+        """
 
-        row = self._fetch_one(query, tuple(params))
+        row = self._fetch_one(query, (user_id,))
         return row[0] if row else 0
 
+    def get_user_notification_counts(self, user_id: str) -> tuple[int, int]:
+        """
+        Get unread and total notification counts for a user in a single scan.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Tuple[int, int]: ``(unread, total)`` counts of unexpired notifications.
+        """
+        row = self._fetch_one(
+            """
+            SELECT COALESCE(SUM(un.is_read = 0), 0), COUNT(*)
+            FROM user_notifications un
+            WHERE un.user_id = ?
+            AND EXISTS (
+                SELECT 1 FROM notifications n
+                WHERE n.id = un.notification_id
+                AND (n.expires_at IS NULL OR n.expires_at > datetime('now'))
+            )
+            """,
+            (user_id,),
+        )
+        return (row[0], row[1]) if row else (0, 0)
+
     def cleanup_expired_user_notifications(self) -> int:
         """
         Delete user notifications for expired notifications.
@@ -954,19 +1266,9 @@ class DatabaseManager:
             bool: True if deletion succeeded, False otherwise.
         """
         try:
-            # The foreign key constraint with ON DELETE CASCADE should handle
-            # user_notifications cleanup automatically, but we'll be explicit
-            with self._transaction() as conn:
-                # First delete user notification entries
-                conn.execute(
-                    "DELETE FROM user_notifications WHERE notification_id = ?",
-                    (notification_id,),
-                )
-
-                # Then delete the notification itself
-                cursor = conn.execute("DELETE FROM notifications WHERE id = ?", (notification_id,))
-
-                return cursor.rowcount > 0
+            # user_notifications rows are removed by ON DELETE CASCADE (foreign_keys is ON per connection)
+            cursor = self._execute("DELETE FROM notifications WHERE id = ?", (notification_id,))
+            return bool(cursor and cursor.rowcount > 0)
 
         except Exception as e:
             logger.error("Error deleting notification %s: %s", notification_id, e)
@@ -987,27 +1289,27 @@ class DatabaseManager:
                 # Get all existing notifications
                 old_notifications = conn.execute("SELECT id, is_read FROM notifications").fetchall()
 
+                # All rows written by this migration share one timestamp and one subscriber list
+                migration_now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                subscriptions = None
+
                 # For each notification, if it was marked as read, we need to create user_notifications entries
                 # Since we don't have user context in the old schema, we'll assume global read state
                 # This is a limitation of the old schema - we can't recover per-user read state
                 for notif in old_notifications:
                     if notif["is_read"]:
                         # Get all active push subscriptions (as a proxy for active users)
-                        subscriptions = conn.execute(
-                            "SELECT DISTINCT user_key FROM push_subscriptions WHERE user_key IS NOT NULL"
-                        ).fetchall()
+                        if subscriptions is None:
+                            subscriptions = conn.execute(
+                                "SELECT DISTINCT user_key FROM push_subscriptions WHERE user_key IS NOT NULL"
+                            ).fetchall()
                         for sub in subscriptions:
                             if sub["user_key"]:
                                 conn.execute(
                                     "INSERT OR IGNORE INTO user_notifications "
                                     "(user_id, notification_id, is_read, read_at) "
                                     "VALUES (?, ?, ?, ?)",
-                                    (
-                                        sub["user_key"],
-                                        notif["id"],
-                                        1,
-                                        datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
-                                    ),
+                                    (sub["user_key"], notif["id"], 1, migration_now),
                                 )
 
                 # Remove the old is_read column
@@ -1088,6 +1390,8 @@ class DatabaseManager:
         except (ValueError, TypeError, RuntimeError) as e:
             logger.error("Error cleaning up push subscriptions for user %s: %s", user_id, e)
             cleanup_counts["push_subscriptions"] = 0
+        finally:
+            self._known_subscriptions.clear()
 
         # Clean up keyword associations
         try:
@@ -1113,27 +1417,48 @@ class DatabaseManager:
     # Helper methods
     def _fetch_one(self, sql: str, params: tuple = ()) -> sqlite3.Row | None:
         """Fetch a single row from the database."""
+        if Config.DB_EXPLAIN_QUERIES:
+            self._explain(sql, params)
         try:
-            with self._lock:
-                return self._conn.execute(sql, params).fetchone()
+            return self._conn.execute(sql, params).fetchone()
         except sqlite3.Error as e:
             logger.error("SQL fetch one error. Query: %s, Params: %s, Error: %s", sql, params, e)
             raise DatabaseError(f"Fetch one failed for SQL: {sql} with params {params}: {e}") from e
 
     def _fetch_all(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
         """Fetch all rows from the database."""
+        if Config.DB_EXPLAIN_QUERIES:
+            self._explain(sql, params)
         try:
-            with self._lock:
-                return self._conn.execute(sql, params).fetchall()
+            return self._conn.execute(sql, params).fetchall()
         except sqlite3.Error as e:
             logger.error("SQL fetch all error. Query: %s, Params: %s, Error: %s", sql, params, e)
             raise DatabaseError(f"Fetch all failed for SQL: {sql} with params {params}: {e}") from e
 
+    def _iter_rows(self, sql: str, params: tuple = (), batch: int = 256) -> Iterator[sqlite3.Row]:
+        """
+        Stream rows from the database in batches of ``batch`` rows.
+
+        Unlike ``_fetch_all`` the full result set is never materialized, so callers
+        building their own containers keep a single copy of the rows in memory.
+        """
+        if Config.DB_EXPLAIN_QUERIES:
+            self._explain(sql, params)
+        try:
+            cursor = self._conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    return
+                yield from rows
+        except sqlite3.Error as e:
+            logger.error("SQL iterate error. Query: %s, Params: %s, Error: %s", sql, params, e)
+            raise DatabaseError(f"Iterate failed for SQL: {sql} with params {params}: {e}") from e
+
     def _safe_execute(self, sql: str, params: tuple = ()) -> Any:
         """Execute SQL safely without transaction."""
         try:
-            with self._lock:
-                return self._conn.execute(sql, params)
+            return self._conn.execute(sql, params)
         except sqlite3.Error as e:
             logger.error("Safe execute error. Query: %s, Params: %s, Error: %s", sql, params, e)
             return None
@@ -1,13 +1,58 @@
 """Data models for the notification app."""
 
 import hashlib
+import struct
+import sys
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+# Bound once: ID generation runs for every scraped post and notification
+_blake2b = hashlib.blake2b
 
-@dataclass
-class Post:
+# Columns accepted by the ``from_database_row`` constructors
+_POST_FIELDS = frozenset(
+    {
+        "id",
+        "title",
+        "content",
+        "publish_date",
+        "location",
+        "department",
+        "category",
+        "link",
+        "is_urgent",
+        "likes",
+        "comments",
+        "has_image",
+        "image_url",
+        "created_at",
+        "updated_at",
+    }
+)
+_USER_NOTIFICATION_FIELDS = frozenset({"id", "user_id", "notification_id", "is_read", "read_at", "created_at"})
+
+
+def _parse_utc(value: str, _fromiso=datetime.fromisoformat, _utc=timezone.utc) -> datetime:
+    """
+    Parse a timestamp from the database as a UTC-aware datetime.
+
+    The database stores every timestamp as naive UTC (``YYYY-MM-DD HH:MM:SS``),
+    so the UTC zone is stamped on unconditionally. The default arguments bind
+    the parser and zone as fast locals for the row-loading loops.
+    """
+    return _fromiso(value).replace(tzinfo=_utc)
+
+
+class _PostIsoCache:
+    """Slot storage for the ISO strings cached by ``Post._iso_dates``."""
+
+    __slots__ = ("_iso_cache",)
+
+
+@dataclass(slots=True, frozen=True, eq=False, repr=False, match_args=False)
+class Post(_PostIsoCache):
     """Represents a blog post."""
 
     title: str
@@ -28,70 +73,137 @@ class Post:
 
     def __post_init__(self) -> None:
         # Validate required fields
-        for field_name in ("title", "content", "location", "department", "category"):
-            value = getattr(self, field_name)
-            if not isinstance(value, str) or not value.strip():
-                raise ValueError(f"{field_name.capitalize()} is required and must be a non-empty string")
+        if not isinstance(self.title, str) or not self.title.strip():
+            raise ValueError("Title is required and must be a non-empty string")
+        if not isinstance(self.content, str) or not self.content.strip():
+            raise ValueError("Content is required and must be a non-empty string")
+        if not isinstance(self.location, str) or not self.location.strip():
+            raise ValueError("Location is required and must be a non-empty string")
+        if not isinstance(self.department, str) or not self.department.strip():
+            raise ValueError("Department is required and must be a non-empty string")
+        if not isinstance(self.category, str) or not self.category.strip():
+            raise ValueError("Category is required and must be a non-empty string")
 
         if not isinstance(self.publish_date, datetime):
             raise ValueError("publish_date must be a datetime object")
 
-        # Generate unique ID if missing
+        # Low-cardinality values repeat across thousands of posts; share one object each
+        object.__setattr__(self, "location", sys.intern(self.location))
+        object.__setattr__(self, "department", sys.intern(self.department))
+        object.__setattr__(self, "category", sys.intern(self.category))
+
+        # A missing ID is left unset and generated on first access, see ``__getattr__``
         if not self.id:
-            self.id = self._generate_id()
+            object.__delattr__(self, "id")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots
+        if name == "id":
+            generated = self._generate_id()
+            object.__setattr__(self, "id", generated)
+            return generated
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _iso_dates(self) -> tuple[str | None, str | None, str | None]:
+        """Return (publish_date, created_at, updated_at) as ISO strings, formatted on first use."""
+        try:
+            return self._iso_cache
+        except AttributeError:
+            iso = (
+                self.publish_date.isoformat() if self.publish_date else None,
+                self.created_at.isoformat() if self.created_at else None,
+                self.updated_at.isoformat() if self.updated_at else None,
+            )
+            object.__setattr__(self, "_iso_cache", iso)
+            return iso
 
     def _generate_id(self) -> str:
         """Create a short, deterministic ID."""
-        hash_input = (
-            f"{self.title}{self.content}{self.publish_date.isoformat()}{self.location}{self.department}{self.category}"
-        )
-        digest = hashlib.sha256(hash_input.encode()).hexdigest()[:8]
         timestamp = int(self.publish_date.timestamp())
+        hash_input = b"".join(
+            (
+                self.title.encode(),
+                self.content.encode(),
+                struct.pack("<q", timestamp),
+                self.location.encode(),
+                self.department.encode(),
+                self.category.encode(),
+            )
+        )
+        # A 4-byte BLAKE2b digest yields the 8 hex chars directly, no truncation needed
+        digest = _blake2b(hash_input, digest_size=4).hexdigest()
         return f"{digest}-{timestamp}"
 
     @classmethod
     def from_database_row(cls, data: dict[str, Any]) -> "Post":
         """Create a Post instance from a database row dictionary."""
         # Handle datetime fields and normalize to UTC-aware
-        if isinstance(data.get("publish_date"), str):
-            dt = datetime.fromisoformat(data["publish_date"])
-            data["publish_date"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
-        if isinstance(data.get("created_at"), str):
-            dt = datetime.fromisoformat(data["created_at"])
-            data["created_at"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
-        if isinstance(data.get("updated_at"), str):
-            dt = datetime.fromisoformat(data["updated_at"])
-            data["updated_at"] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+        for key in ("publish_date", "created_at", "updated_at"):
+            if isinstance(data.get(key), str):
+                data[key] = _parse_utc(data[key])
 
         # Filter out any extra fields that aren't part of the dataclass
-        valid_fields = {
-            "id",
-            "title",
-            "content",
-            "publish_date",
-            "location",
-            "department",
-            "category",
-            "link",
-            "is_urgent",
-            "likes",
-            "comments",
-            "has_image",
-            "image_url",
-            "created_at",
-            "updated_at",
-        }
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: data[k] for k in data.keys() & _POST_FIELDS}
 
         return cls(**filtered_data)
 
+    @classmethod
+    def from_database_row_trusted(cls, data: dict[str, Any]) -> "Post":
+        """
+        Create a Post from a full ``posts`` table row without re-validating it.
+
+        Rows read back from the database were validated on insert and already
+        carry their ID, so ``__post_init__`` (validation and ID hashing) is skipped.
+        Columns that are not Post fields (e.g. added by a later migration) are ignored.
+        """
+        for key in ("publish_date", "created_at", "updated_at"):
+            if isinstance(data.get(key), str):
+                data[key] = _parse_utc(data[key])
+        return cls._from_trusted(data)
+
+    @classmethod
+    def from_database_rows_trusted(cls, rows: Iterable[Mapping[str, Any]]) -> list["Post"]:
+        """
+        Create Posts from many full ``posts`` table rows, see ``from_database_row_trusted``.
+
+        Posts stored in the same transaction share their created_at/updated_at
+        strings, so each distinct timestamp string is parsed once per batch.
+        """
+        parsed: dict[str, datetime] = {}
+        posts = []
+        for row in rows:
+            data = dict(row)
+            for key in ("publish_date", "created_at", "updated_at"):
+                value = data.get(key)
+                if isinstance(value, str):
+                    dt = parsed.get(value)
+                    if dt is None:
+                        dt = parsed[value] = _parse_utc(value)
+                    data[key] = dt
+            posts.append(cls._from_trusted(data))
+        return posts
+
+    @classmethod
+    def _from_trusted(cls, data: dict[str, Any]) -> "Post":
+        """Assign already-parsed fields directly, bypassing ``__init__`` and ``__post_init__``."""
+        obj = object.__new__(cls)
+        for key, value in data.items():
+            # Slots reject unknown names, so extra columns are skipped rather than assigned
+            if key in _POST_FIELDS:
+                object.__setattr__(obj, key, value)
+        return obj
+
+    def __repr__(self) -> str:
+        return f"Post(id={self.id!r})"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert post to dictionary for JSON serialization."""
+        publish_date, created_at, updated_at = self._iso_dates()
         return {
             "id": self.id,
             "title": self.title,
             "content": self.content,
-            "publish_date": (self.publish_date.isoformat() if self.publish_date else None),
+            "publish_date": publish_date,
             "location": self.location,
             "department": self.department,
             "category": self.category,
@@ -101,13 +213,19 @@ class Post:
             "comments": self.comments,
             "has_image": self.has_image,
             "image_url": self.image_url,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": created_at,
+            "updated_at": updated_at,
         }
 
 
-@dataclass
-class Notification:
+class _NotificationIsoCache:
+    """Slot storage for the ISO strings cached by ``Notification._iso_dates``."""
+
+    __slots__ = ("_iso_cache",)
+
+
+@dataclass(slots=True, frozen=True, eq=False, repr=False, match_args=False)
+class Notification(_NotificationIsoCache):
     """Represents a user notification."""
 
     post_id: str
@@ -121,39 +239,62 @@ class Notification:
 
     def __post_init__(self) -> None:
         """Validate and initialize the notification."""
-        if not isinstance(self.post_id, str) or not self.post_id:
+        if not self.post_id or not isinstance(self.post_id, str):
             raise ValueError("post_id is required and must be a non-empty string")
-        if not isinstance(self.title, str) or not self.title:
+        if not self.title or not isinstance(self.title, str):
             raise ValueError("title is required and must be a non-empty string")
-        if not isinstance(self.message, str) or not self.message:
+        if not self.message or not isinstance(self.message, str):
             raise ValueError("message is required and must be a non-empty string")
         if not isinstance(self.created_at, datetime):
             raise ValueError("created_at must be a datetime object")
 
         # Set default expiration to 30 days after creation
         if self.expires_at is None:
-            self.expires_at = self.created_at + timedelta(days=30)
+            object.__setattr__(self, "expires_at", self.created_at + timedelta(days=30))
 
-        # Generate notification ID if missing
+        # A missing notification ID is left unset and generated on first access, see ``__getattr__``
         if not self.id:
-            self.id = self._generate_id()
+            object.__delattr__(self, "id")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for unset slots
+        if name == "id":
+            generated = self._generate_id()
+            object.__setattr__(self, "id", generated)
+            return generated
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _iso_dates(self) -> tuple[str | None, str | None]:
+        """Return (created_at, expires_at) as ISO strings, formatted on first use."""
+        try:
+            return self._iso_cache
+        except AttributeError:
+            iso = (
+                self.created_at.isoformat() if self.created_at else None,
+                self.expires_at.isoformat() if self.expires_at else None,
+            )
+            object.__setattr__(self, "_iso_cache", iso)
+            return iso
 
     def _generate_id(self) -> str:
         """Create a short, deterministic ID based on post_id, message, and created_at."""
-        base = f"{self.post_id}{self.message}{self.created_at.isoformat()}"
-        return f"notif-{hashlib.sha256(base.encode()).hexdigest()[:8]}"
+        base = b"".join((self.post_id.encode(), self.message.encode(), struct.pack("<d", self.created_at.timestamp())))
+        return f"notif-{_blake2b(base, digest_size=4).hexdigest()}"
 
     @classmethod
     def from_database_row(cls, data: dict[str, Any]) -> "Notification":
         """Create a Notification instance from a database row dictionary."""
         for key in ("created_at", "expires_at"):
             if isinstance(data.get(key), str):
-                dt = datetime.fromisoformat(data[key])
-                data[key] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+                data[key] = _parse_utc(data[key])
         return cls(**data)
 
+    def __repr__(self) -> str:
+        return f"Notification(id={self.id!r}, post_id={self.post_id!r})"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert notification to dictionary for JSON serialization."""
+        created_at, expires_at = self._iso_dates()
         return {
             "id": getattr(self, "id", None),
             "post_id": self.post_id,
@@ -161,12 +302,12 @@ class Notification:
             "message": self.message,
             "image_url": self.image_url,
             "is_urgent": self.is_urgent,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "created_at": created_at,
+            "expires_at": expires_at,
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False, repr=False, match_args=False)
 class UserNotification:
     """Represents a user's relationship to a notification with read state."""
 
@@ -188,29 +329,23 @@ class UserNotification:
 
         # Set created_at if not provided
         if self.created_at is None:
-            self.created_at = datetime.now(timezone.utc)
+            object.__setattr__(self, "created_at", datetime.now(timezone.utc))
 
     @classmethod
     def from_database_row(cls, data: dict[str, Any]) -> "UserNotification":
         """Create a UserNotification instance from a database row dictionary."""
         for key in ("read_at", "created_at"):
             if isinstance(data.get(key), str):
-                dt = datetime.fromisoformat(data[key])
-                data[key] = dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+                data[key] = _parse_utc(data[key])
 
         # Filter out any extra fields that aren't part of the dataclass
-        valid_fields = {
-            "id",
-            "user_id",
-            "notification_id",
-            "is_read",
-            "read_at",
-            "created_at",
-        }
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
+        filtered_data = {k: data[k] for k in data.keys() & _USER_NOTIFICATION_FIELDS}
 
         return cls(**filtered_data)
 
+    def __repr__(self) -> str:
+        return f"UserNotification(user_id={self.user_id!r}, notification_id={self.notification_id!r})"
+
     def to_dict(self) -> dict[str, Any]:
         """Convert user notification to dictionary for JSON serialization."""
         return {
@@ -19,36 +19,113 @@ Notification Flow:
 7. Push notifications sent to eligible subscriptions with opt-out enforcement
 """
 
+import copy
+import dataclasses
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from typing import Any
+from urllib.parse import urlparse
 
+import requests
+from py_vapid import Vapid, VapidException
 from pywebpush import WebPushException, webpush
+from requests.adapters import HTTPAdapter
 
 from app.core.config import Config
-from app.db.database import DatabaseManager
+from app.db.database import DatabaseError, DatabaseManager
 from app.db.models import Notification, Post
 
+try:
+    import ahocorasick
+except ImportError:  # optional, installed with the "fast" extra
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass(slots=True, frozen=True)
+class _MatchIndex:
+    """Users grouped by their filter settings, so a post's recipients are a few set operations."""
+
+    # Users without an active location filter (disabled or no locations selected)
+    location_unfiltered: frozenset[str]
+    # Location -> users whose location filter includes it
+    location_users: dict[str, set[str]]
+    # Users without an active keyword filter (disabled or no keywords saved)
+    keyword_unfiltered: frozenset[str]
+    # Lowercased keyword -> users filtering on it
+    keyword_users: dict[str, set[str]]
+    all_users: frozenset[str]
+    # Aho-Corasick automaton over ``keyword_users`` when pyahocorasick is installed
+    keyword_automaton: Any = None
+
+
 class NotificationService:
     """Service for managing notifications."""
 
-    # This class is only used by the polling service so it doesn't need the
-    # background worker threads that existed previously. Notifications are
-    # delivered synchronously when created.
+    # The create methods only store notifications and return. Resolving recipients,
+    # recording per-user entries and push delivery run on a single dispatch thread
+    # so the polling thread is not blocked; pushes fan out on a shared executor.
 
     MAX_CONTENT_LENGTH = 75  # Maximum length of notification message content
+    URGENT_PREFIX = "🚨 URGENT: "  # Prepended to the titles of urgent posts
 
     def __init__(self, db: DatabaseManager) -> None:
         """Initialize notification service."""
         self.db = db
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notif-dispatch")
+        self._push_executor = ThreadPoolExecutor(max_workers=Config.PUSH_FANOUT_CONCURRENCY, thread_name_prefix="push")
+        # Keep-alive connections to the push services, one pool slot per delivery thread
+        self._push_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=Config.PUSH_FANOUT_CONCURRENCY)
+        self._push_session.mount("https://", adapter)
+        self._push_session.mount("http://", adapter)
+        # user_key -> (expiry on the monotonic clock, settings); see Config.SETTINGS_CACHE_TTL.
+        # Guarded by _cache_lock and _cache_generation like the match cache below.
+        self._settings_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Parsed settings of all users and their match index: (expiry, all_settings, match_index).
+        # Bumping the generation on invalidation keeps a load that raced with a settings change
+        # from being stored.
+        self._match_cache: tuple[float, dict[str, dict[str, Any]], _MatchIndex] | None = None
+        self._cache_generation = 0
+        self._cache_lock = threading.RLock()
+        # Earliest monotonic time the next push may be queued; see Config.PUSH_THROTTLE_PER_SEC
+        self._next_push_slot = 0.0
+        self._throttle_lock = threading.Lock()
+        # Signed VAPID headers per push service origin: origin -> (JWT expiry, headers)
+        self._vapid: Vapid | None = None
+        self._vapid_headers: dict[str, tuple[int, dict[str, str]]] = {}
+        self._vapid_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Wait for queued dispatches and push deliveries, then stop the threads and close connections."""
+        self._dispatch_pool.shutdown(wait=True)
+        self._push_executor.shutdown(wait=True)
+        self._push_session.close()
 
     def get_settings(self, user_key: str) -> dict[str, Any]:
-        """Get notification settings for a user."""
+        """Get notification settings for a user, served from a short-lived cache when fresh."""
+        with self._cache_lock:
+            cached = self._settings_cache.get(user_key)
+            generation = self._cache_generation
+        if cached and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+
+        settings = self._load_settings(user_key)
+        if Config.SETTINGS_CACHE_TTL > 0:
+            with self._cache_lock:
+                # Skip storing when an invalidation ran during the load; the result may be stale
+                if generation == self._cache_generation:
+                    expiry = time.monotonic() + Config.SETTINGS_CACHE_TTL
+                    self._settings_cache[user_key] = (expiry, copy.deepcopy(settings))
+        return settings
+
+    def _load_settings(self, user_key: str) -> dict[str, Any]:
+        """Read a user's notification settings and keywords from the database, filling in defaults."""
         try:
             # Get settings from database
             settings = self.db.get_notification_settings(user_key)
@@ -160,6 +237,9 @@ class NotificationService:
         except (ValueError, TypeError, json.JSONDecodeError) as e:
             logger.error("Error updating notification settings: %s", e)
             return False
+        finally:
+            # Keywords may have changed even if the settings write failed or raised
+            self.invalidate(user_key)
 
     def create_post_notification(self, post: Post) -> Notification | None:
         """
@@ -177,113 +257,195 @@ class NotificationService:
             The created notification, or None if creation failed
         """
         try:
-            # Truncate content if too long
-            content = post.content or ""
-            if len(content) > self.MAX_CONTENT_LENGTH:
-                content = content[: self.MAX_CONTENT_LENGTH - 3] + "..."
-
-            # URGENT path: For urgent posts, bypass all filters and target all users
-            if post.is_urgent:
-                target_users = None  # None = "all users with push enabled" - URGENT path
-                logger.info(
-                    "URGENT post %s will be sent to all users with push notifications enabled",
-                    post.id,
-                )
-            else:
-                # Get users who match filters for non-urgent posts
-                target_users = self._get_filtered_users_for_post(post)
+            notification = self._build_notification(post)
+            notification_id = self.db.add_notification(notification)
+        except (ValueError, TypeError) as e:
+            return self._fallback_notification(post, e)
+        if not notification_id:
+            return None
 
-                # For non-urgent posts, if no users match filters, skip delivery entirely
-                if target_users is not None and len(target_users) == 0:
-                    logger.info(
-                        "No recipients match filters; skipping push delivery for post %s",
-                        post.id,
-                    )
-                    # Still create the notification but return early without delivery
-                    notification = Notification(
-                        post_id=post.id,
-                        title=f"{'🚨 URGENT: ' if post.is_urgent else ''}{post.title}",
-                        message=content,
-                        image_url=post.image_url if post.has_image else None,
-                        created_at=datetime.now(timezone.utc),
-                        is_urgent=post.is_urgent,
-                    )
+        notification = dataclasses.replace(notification, id=str(notification_id))
+        self._submit_dispatch([(post, notification)])
+        return notification
 
-                    notification_id = self.db.add_notification(notification)
-                    if notification_id:
-                        notification.id = str(notification_id)
-                    return notification
+    def create_bulk_notification(self, posts: list[Post]) -> list[Notification]:
+        """Create notifications for multiple posts."""
+        notifications = []
 
-            notification = Notification(
-                post_id=post.id,
-                title=f"{'🚨 URGENT: ' if post.is_urgent else ''}{post.title}",
-                message=content,
-                image_url=post.image_url if post.has_image else None,
-                created_at=datetime.now(timezone.utc),
-                is_urgent=post.is_urgent,
-            )
+        built = []
+        for post in posts:
+            try:
+                built.append((post, self._build_notification(post)))
+            except (ValueError, TypeError) as e:
+                notifications.append(self._fallback_notification(post, e))
 
-            notification_id = self.db.add_notification(notification)
-            if notification_id:
-                # Create user notification entries for targeted users
-                if target_users is None:
-                    # URGENT path: get all users with push subscriptions as proxy for all users
-                    all_subscriptions = self.db.get_push_subscriptions_for_users([], urgent=True)
-                    all_settings = self.db.get_all_notification_settings()
-                    all_user_keys_combined = list(
-                        {sub.get("user_key") for sub in all_subscriptions if sub.get("user_key")}
-                        | set(all_settings.keys())
-                    )
-                    if all_user_keys_combined:
-                        self.db.add_user_notifications_bulk(notification_id, all_user_keys_combined)
-                    else:
-                        logger.warning("No users found for urgent notification %s", notification_id)
-                elif target_users:
-                    # Normal path: targeted users only (skip if empty)
-                    self.db.add_user_notifications_bulk(notification_id, list(target_users))
-                else:
-                    logger.info("No target users for notification %s", notification_id)
+        # Store all notifications in one transaction
+        notification_ids = self.db.add_notifications_bulk([notification for _, notification in built])
 
-                # Set the ID on our notification object
-                notification.id = str(notification_id)
+        stored = []
+        for (post, notification), notification_id in zip(built, notification_ids, strict=True):
+            if notification_id:
+                stored.append((post, dataclasses.replace(notification, id=str(notification_id))))
+        notifications.extend(notification for _, notification in stored)
 
-                # Deliver notification to target users with post URL (skip if empty target_users)
-                if target_users is None or (target_users is not None and len(target_users) > 0):
-                    post_url = post.link if post.link else None
-                    self._deliver_notification(notification, target_users, post_url)
+        if stored:
+            self._submit_dispatch(stored)
+        return notifications
 
-                return notification
+    def _submit_dispatch(self, items: list[tuple[Post, Notification]]) -> None:
+        """Queue ``items`` for delivery on the dispatch thread, logging any failure it raises."""
+        future = self._dispatch_pool.submit(self._dispatch_notifications, items)
+        future.add_done_callback(self._log_dispatch_failure)
+
+    @staticmethod
+    def _log_dispatch_failure(future: Future) -> None:
+        """Log an error that escaped ``_dispatch_notifications``; nothing else reads the future."""
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            logger.error("Notification dispatch failed", exc_info=error)
+
+    def _build_notification(self, post: Post) -> Notification:
+        """Build the (unsaved) notification for ``post``."""
+        # Truncate content if too long
+        content = post.content or ""
+        if len(content) > self.MAX_CONTENT_LENGTH:
+            content = content[: self.MAX_CONTENT_LENGTH - 3] + "..."
+
+        return Notification(
+            post_id=post.id,
+            title=self.URGENT_PREFIX + post.title if post.is_urgent else post.title,
+            message=content,
+            image_url=post.image_url if post.has_image else None,
+            created_at=datetime.now(timezone.utc),
+            is_urgent=post.is_urgent,
+        )
+
+    def _dispatch_notifications(self, items: list[tuple[Post, Notification]]) -> None:
+        """
+        Resolve recipients, record per-user entries and queue pushes for stored notifications.
 
-        except (ValueError, TypeError, json.JSONDecodeError) as e:
-            logger.error("Failed to create notification for post %s: %s", post.id, e)
-            # Return a basic notification as fallback
-            return Notification(
-                post_id=post.id,
-                title="New Post Notification",
-                message="Content not available",
-                created_at=datetime.now(timezone.utc),
-                is_urgent=False,
+        Runs on the dispatch thread. Settings and keywords are loaded once for the whole
+        batch; keywords are indexed by keyword, so each post is scanned once per distinct
+        keyword rather than once per user.
+        """
+        try:
+            all_settings, match_index = self._get_match_data()
+        except (ValueError, TypeError, DatabaseError) as e:
+            logger.error(
+                "Failed to load notification settings, dropping delivery of %d notifications: %s", len(items), e
             )
+            return
 
-    def create_bulk_notification(self, posts: list[Post]) -> list[Notification]:
-        """Create notifications for multiple posts."""
-        notifications = []
+        # Per-user entries of the whole batch are written in one transaction before any push goes out
+        pairs: list[tuple[int, str]] = []
+        deliveries: list[tuple[Notification, set[str] | None, str | None]] = []
+        urgent_recipients: list[str] | None = None
+        for post, notification in items:
+            try:
+                if post.is_urgent:
+                    # URGENT path: For urgent posts, bypass all filters and target all users
+                    logger.info(
+                        "URGENT post %s will be sent to all users with push notifications enabled",
+                        post.id,
+                    )
+                    if urgent_recipients is None:
+                        urgent_recipients = self._get_urgent_recipients(all_settings)
+                    if not urgent_recipients:
+                        logger.warning("No users found for urgent notification %s", notification.id)
+                    recipients: list[str] = urgent_recipients
+                    target_users = None  # None = "all users with push enabled" - URGENT path
+                else:
+                    # Get users who match filters for non-urgent posts
+                    target_users = self._get_filtered_users_for_post(post, match_index)
+                    # For non-urgent posts, if no users match filters, skip delivery entirely
+                    if not target_users:
+                        logger.info(
+                            "No recipients match filters; skipping push delivery for post %s",
+                            post.id,
+                        )
+                        continue
+                    recipients = list(target_users)
+            except (ValueError, TypeError, DatabaseError) as e:
+                logger.error(
+                    "Failed to resolve recipients of notification %s for post %s: %s", notification.id, post.id, e
+                )
+                continue
 
-        # Process all posts - no special handling needed since
-        # create_post_notification handles filtering internally
-        for post in posts:
-            if notification := self.create_post_notification(post):
-                notifications.append(notification)
+            notification_id = int(notification.id)
+            pairs.extend((notification_id, user_key) for user_key in recipients)
+            deliveries.append((notification, target_users, post.link if post.link else None))
 
-        return notifications
+        try:
+            self.db.add_user_notifications_multi(pairs)
+        except DatabaseError as e:
+            logger.error("Failed to record recipients, dropping delivery of %d notifications: %s", len(deliveries), e)
+            return
+
+        # Deliver notifications to target users with post URL
+        for notification, target_users, post_url in deliveries:
+            try:
+                self._deliver_notification(notification, target_users, post_url)
+            except DatabaseError as e:
+                logger.error("Failed to deliver notification %s: %s", notification.id, e)
+
+    def _get_urgent_recipients(self, all_settings: dict[str, dict[str, Any]]) -> list[str]:
+        """Users recorded for urgent posts: everyone with settings or a push subscription."""
+        # Users with push subscriptions stand in for all users
+        return list(set(self.db.get_subscribed_user_keys()) | set(all_settings))
+
+    def _get_match_data(self) -> tuple[dict[str, dict[str, Any]], _MatchIndex]:
+        """Parsed settings and match index of all users, cached for SETTINGS_CACHE_TTL seconds."""
+        with self._cache_lock:
+            cached = self._match_cache
+            generation = self._cache_generation
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        all_settings = self._parse_all_settings(self.db.get_all_notification_settings())
+        # Keywords of users without an active keyword filter are ignored by the index
+        user_keywords = self.db.get_all_user_keywords()
+        match_index = self._build_match_index(all_settings, user_keywords)
+
+        if Config.SETTINGS_CACHE_TTL > 0:
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    expiry = time.monotonic() + Config.SETTINGS_CACHE_TTL
+                    self._match_cache = (expiry, all_settings, match_index)
+        return all_settings, match_index
+
+    def invalidate(self, user_key: str) -> None:
+        """Drop cached settings and keywords after ``user_key``'s preferences changed."""
+        with self._cache_lock:
+            self._settings_cache.pop(user_key, None)
+            # Matching data spans all users and is rebuilt with a single query, so it is reloaded whole
+            self._match_cache = None
+            self._cache_generation += 1
+
+    @staticmethod
+    def _fallback_notification(post: Post, error: Exception) -> Notification:
+        """Log a failed notification and return a basic, unsaved one in its place."""
+        logger.error("Failed to create notification for post %s: %s", post.id, error)
+        return Notification(
+            post_id=post.id,
+            title="New Post Notification",
+            message="Content not available",
+            created_at=datetime.now(timezone.utc),
+            is_urgent=False,
+        )
 
     def send_push_notification(
         self,
         subscription: dict[str, Any],
         notification: Notification,
         post_url: str | None = None,
+        payload: bytes | None = None,
     ) -> bool:
-        """Send a push notification to a subscription."""
+        """
+        Send a push notification to a subscription.
+
+        ``payload`` is the pre-serialized message from ``_build_push_payload``; it is built
+        here when not given, so fan-out callers can serialize once for all recipients.
+        """
 
         endpoint = subscription.get("endpoint")
         user_key = subscription.get("user_key", "unknown")
@@ -297,29 +459,15 @@ class NotificationService:
                 )
                 return False
 
-            if not Config.PUSH_VAPID_PRIVATE_KEY or not Config.PUSH_VAPID_CLAIMS:
-                logger.error("VAPID configuration missing for push notification")
-                return False
-
-            payload = json.dumps(
-                {
-                    "title": notification.title,
-                    "body": notification.message,
-                    "icon": notification.image_url,
-                    "url": post_url,
-                    "data": {
-                        "post_url": post_url,
-                        "post_id": notification.post_id,
-                    },
-                }
-            )
+            if payload is None:
+                payload = self._build_push_payload(notification, post_url)
             ttl = getattr(Config, "PUSH_TTL", 86400)
             webpush(
                 subscription_info=subscription,
                 data=payload,
-                vapid_private_key=Config.PUSH_VAPID_PRIVATE_KEY,
-                vapid_claims=Config.PUSH_VAPID_CLAIMS.copy(),
+                headers=self._get_vapid_headers(endpoint),
                 ttl=ttl,
+                requests_session=self._push_session,
             )
             if endpoint:
                 self.db.update_subscription_last_used(endpoint)
@@ -335,7 +483,8 @@ class NotificationService:
                 e,
             )
             # Mark invalid subscriptions for removal on HTTP error codes that indicate permanent failure
-            if e.response and e.response.status_code in (400, 404, 410, 413):
+            # An error Response is falsy, so test for presence explicitly
+            if e.response is not None and e.response.status_code in (400, 404, 410, 413):
                 logger.info(
                     "Removing invalid subscription for user %s due to HTTP %d",
                     user_key,
@@ -343,7 +492,7 @@ class NotificationService:
                 )
                 self.db.remove_push_subscription(subscription)
             return False
-        except (TypeError, ValueError, json.JSONDecodeError) as e:
+        except (TypeError, ValueError, json.JSONDecodeError, VapidException) as e:
             logger.error(
                 "Error preparing push notification for user %s, post %s: %s",
                 user_key,
@@ -357,7 +506,7 @@ class NotificationService:
         notification: Notification,
         target_users: set[str] | None = None,
         post_url: str | None = None,
-    ) -> None:
+    ) -> list[Future]:
         """
         Send a notification to targeted subscriptions based on user filters.
 
@@ -366,53 +515,97 @@ class NotificationService:
             target_users: Set of user keys that should receive this notification.
                          If None, sends to all users with push notifications enabled (URGENT path).
             post_url: URL of the blog post associated with the notification.
-        """
-        # Get subscriptions based on target users
-        if target_users is None:
-            # URGENT path: For urgent posts - get all subscriptions
-            subscriptions = self.db.get_push_subscriptions_for_users([], urgent=True)
-        else:
-            # Normal path: Get subscriptions only for targeted users
-            subscriptions = self.db.get_push_subscriptions_for_users(list(target_users))
-
-        # Apply push notification preference filtering
-        all_settings = self.db.get_all_notification_settings()
-        filtered_subscriptions = []
-
-        for sub in subscriptions:
-            user_key = sub.get("user_key")
-            if not user_key:
-                continue
 
-            # Check if user has push notifications enabled
-            user_settings = all_settings.get(user_key, {})
-            if isinstance(user_settings, str):
-                try:
-                    user_settings = json.loads(user_settings)
-                except (ValueError, json.JSONDecodeError):
-                    user_settings = {}
-
-            # Only include if push notifications are enabled (default to True for backward compatibility)
-            if user_settings.get("pushNotifications", True):
-                filtered_subscriptions.append(sub)
+        Returns:
+            List[Future]: Push deliveries still in flight when the last subscription was queued.
+        """
+        if not Config.PUSH_VAPID_PRIVATE_KEY or not Config.PUSH_VAPID_CLAIMS:
+            logger.error("VAPID configuration missing, not sending push notification %s", notification.id)
+            return []
+
+        # Subscriptions of users who turned push notifications off are filtered out in SQL.
+        # URGENT path (target_users is None) streams all subscriptions; new pushes are only
+        # queued while fewer than two per worker are in flight.
+        chunks = self.db.iter_eligible_push_subscriptions(
+            None if target_users is None else list(target_users), urgent=target_users is None
+        )
+        payload = self._build_push_payload(notification, post_url)
+        max_in_flight = 2 * Config.PUSH_FANOUT_CONCURRENCY
+        in_flight: set[Future] = set()
+        for chunk in chunks:
+            for sub in chunk:
+                while len(in_flight) >= max_in_flight:
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                self._throttle_push()
+                in_flight.add(
+                    self._push_executor.submit(self.send_push_notification, sub, notification, post_url, payload)
+                )
+        return list(in_flight)
+
+    def _throttle_push(self) -> None:
+        """Pace push submissions to Config.PUSH_THROTTLE_PER_SEC (0 = unlimited)."""
+        rate = Config.PUSH_THROTTLE_PER_SEC
+        if rate <= 0:
+            return
+        with self._throttle_lock:
+            now = time.monotonic()
+            # Idle time does not build up credit, so a new broadcast starts at the steady rate
+            slot = max(self._next_push_slot, now)
+            self._next_push_slot = slot + 1 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    # Lifetime of a signed VAPID JWT (the maximum push services accept is 24h), and how long
+    # before expiry a cached one is replaced so requests never carry a token about to lapse
+    VAPID_TOKEN_LIFETIME = 12 * 60 * 60
+    VAPID_TOKEN_REFRESH_MARGIN = 60 * 60
+
+    def _get_vapid_headers(self, endpoint: str) -> dict[str, str]:
+        """
+        VAPID authorization headers for ``endpoint``'s origin.
 
-        # Send notifications to filtered subscriptions
-        with ThreadPoolExecutor(max_workers=min(10, len(filtered_subscriptions))) as executor:
-            for sub in filtered_subscriptions:
-                executor.submit(self.send_push_notification, sub, notification, post_url)
+        The JWT only depends on the origin ("aud") and expiry, so one ECDSA signature is
+        shared by every subscription on the same push service until it nears expiry.
+        """
+        url = urlparse(endpoint)
+        origin = f"{url.scheme}://{url.netloc}"
+        now = int(time.time())
+        with self._vapid_lock:
+            cached = self._vapid_headers.get(origin)
+            if cached and cached[0] - self.VAPID_TOKEN_REFRESH_MARGIN > now:
+                return cached[1]
+            if self._vapid is None:
+                self._vapid = Vapid.from_string(private_key=Config.PUSH_VAPID_PRIVATE_KEY)
+            expires = now + self.VAPID_TOKEN_LIFETIME
+            headers = self._vapid.sign({**Config.PUSH_VAPID_CLAIMS, "aud": origin, "exp": expires})
+            self._vapid_headers[origin] = (expires, headers)
+            return headers
+
+    @staticmethod
+    def _build_push_payload(notification: Notification, post_url: str | None) -> bytes:
+        """Serialize the push message shown to every recipient of ``notification``."""
+        return json.dumps(
+            {
+                "title": notification.title,
+                "body": notification.message,
+                "icon": notification.image_url,
+                "url": post_url,
+                "data": {
+                    "post_url": post_url,
+                    "post_id": notification.post_id,
+                },
+            }
+        ).encode("utf-8")
 
     def _validate_subscription(self, subscription: dict[str, Any]) -> bool:
         """Validate push subscription format."""
-        required_fields = ["endpoint", "keys"]
-        if not all(field in subscription for field in required_fields):
-            return False
-
-        keys = subscription.get("keys", {})
-        required_keys = ["p256dh", "auth"]
-        if not all(key in keys for key in required_keys):
-            return False
-
-        return True
+        keys = subscription.get("keys")
+        return (
+            isinstance(subscription.get("endpoint"), str)
+            and isinstance(keys, dict)
+            and "p256dh" in keys
+            and "auth" in keys
+        )
 
     def create_test_notification(self) -> Notification | None:
         """Create a test notification with inline text."""
@@ -425,7 +618,7 @@ class NotificationService:
                 created_at=datetime.now(timezone.utc),
                 is_urgent=False,
             )
-            self._deliver_notification(notif, None, None)
+            wait(self._deliver_notification(notif, None, None))
             return notif
 
         except (ValueError, TypeError, json.JSONDecodeError) as e:
@@ -433,100 +626,117 @@ class NotificationService:
 
         return None
 
-    def _get_filtered_users_for_post(self, post: Post) -> set[str]:
+    @staticmethod
+    def _parse_all_settings(raw_settings: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        """Decode each user's stored settings JSON once; unreadable settings fall back to defaults."""
+        parsed = {}
+        for user_key, raw in raw_settings.items():
+            if not isinstance(raw, str):
+                parsed[user_key] = raw
+                continue
+            try:
+                parsed[user_key] = json.loads(raw)
+            except (ValueError, json.JSONDecodeError):
+                logger.warning("Ignoring unreadable notification settings for user %s", user_key)
+                parsed[user_key] = {}
+        return parsed
+
+    def _get_filtered_users_for_post(self, post: Post, match_index: _MatchIndex) -> set[str]:
         """
         Get the set of user keys who should receive notifications for this post
         based on their location and keyword filter settings.
 
         Args:
             post: The post to check filters against.
+            match_index: Users grouped by filter settings, from ``_build_match_index``.
 
         Returns:
             Set[str]: User keys that match the post filters.
         """
-        try:
-            # Get all user settings
-            all_settings = self.db.get_all_notification_settings()
-
-            # Filter by location first
-            location_filtered_users = self._filter_by_location(post, all_settings)
-            if not location_filtered_users:
-                logger.info("No users match location filter for post %s", post.id)
-                return set()
-
-            # Then filter by keywords
-            keyword_filtered_users = self._filter_by_keywords(post, location_filtered_users, all_settings)
-            if not keyword_filtered_users:
-                logger.info("No users match keyword filter for post %s", post.id)
-
-            return keyword_filtered_users
-
-        except (ValueError, TypeError, json.JSONDecodeError) as e:
-            logger.error("Error filtering users for post %s: %s", post.id, e)
+        # Filter by location first
+        location_filtered_users = self._filter_by_location(post, match_index)
+        if not location_filtered_users:
+            logger.info("No users match location filter for post %s", post.id)
             return set()
 
-    def _filter_by_location(self, post: Post, all_settings: dict[str, Any]) -> set[str]:
-        """Filter users by location preferences."""
-        location_filtered_users = set()
-
-        for user_key, raw_settings in all_settings.items():
-            settings = json.loads(raw_settings) if isinstance(raw_settings, str) else raw_settings
-
-            location_filter = settings.get("locationFilter", {})
-            if not location_filter.get("enabled", False):
-                # Location filter disabled - user should receive all posts
-                location_filtered_users.add(user_key)
-                continue
-
-            user_locations = location_filter.get("locations", [])
-            if not user_locations:
-                # Filter enabled but no locations selected - treat as "no filter" (send all)
-                location_filtered_users.add(user_key)
-                continue
+        # Then filter by keywords
+        keyword_filtered_users = self._filter_by_keywords(post, location_filtered_users, match_index)
+        if not keyword_filtered_users:
+            logger.info("No users match keyword filter for post %s", post.id)
 
-            # Handle posts with no location: bypass location filters (include all users)
-            # Posts without location are sent to all users regardless of location filter settings
-            if post.location is None or post.location == "":
-                # No location = all users (subject to keyword filters)
-                location_filtered_users.add(user_key)
-            elif post.location in user_locations:
-                location_filtered_users.add(user_key)
+        return keyword_filtered_users
 
-        return location_filtered_users
+    @staticmethod
+    def _filter_by_location(post: Post, match_index: _MatchIndex) -> set[str]:
+        """Filter users by location preferences."""
+        # Posts without a location are sent to all users regardless of location filter settings
+        if not post.location:
+            return set(match_index.all_users)
+        return match_index.location_unfiltered | match_index.location_users.get(post.location, set())
 
-    def _filter_by_keywords(
-        self,
-        post: Post,
-        location_filtered_users: set[str],
-        all_settings: dict[str, Any],
-    ) -> set[str]:
+    @staticmethod
+    def _filter_by_keywords(post: Post, location_filtered_users: set[str], match_index: _MatchIndex) -> set[str]:
         """Filter users by keyword preferences."""
-        keyword_filtered_users = set()
-
-        for user_key in location_filtered_users:
-            settings = all_settings.get(user_key, {})
-            if isinstance(settings, str):
-                settings = json.loads(settings)
-
-            keyword_filter = settings.get("keywordFilter", {"enabled": False})
-            if not keyword_filter.get("enabled", False):
-                # Keyword filter disabled - user should receive all posts
-                keyword_filtered_users.add(user_key)
-                continue
-
-            # Get user's keywords from database
-            keywords = self.db.get_user_keywords(user_key)
-            if not keywords:
-                # No keywords set - treat as "no filter" (send all)
-                keyword_filtered_users.add(user_key)
-                continue
-
-            # Check if any keyword matches the post content
-            content_lower = f"{post.title} {post.content}".lower()
-            if any(kw.lower() in content_lower for kw in keywords):
-                keyword_filtered_users.add(user_key)
-
-        return keyword_filtered_users
+        if not match_index.keyword_users or location_filtered_users <= match_index.keyword_unfiltered:
+            # No remaining candidate filters by keyword: every location match passes
+            return location_filtered_users
+
+        content_lower = f"{post.title} {post.content}".lower()
+        matched_users = set(match_index.keyword_unfiltered)
+        if match_index.keyword_automaton is not None:
+            # One pass over the content finds every keyword it contains
+            for keyword in {keyword for _, keyword in match_index.keyword_automaton.iter(content_lower)}:
+                matched_users |= match_index.keyword_users[keyword]
+        else:
+            # Each distinct keyword is checked against the post content once
+            for keyword, users in match_index.keyword_users.items():
+                if keyword in content_lower:
+                    matched_users |= users
+        return location_filtered_users & matched_users
+
+    @staticmethod
+    def _build_match_index(all_settings: dict[str, dict[str, Any]], user_keywords: dict[str, list[str]]) -> _MatchIndex:
+        """Group users by their location and keyword filters."""
+        location_unfiltered = set()
+        location_users: dict[str, set[str]] = {}
+        keyword_unfiltered = set()
+        keyword_users: dict[str, set[str]] = {}
+
+        for user_key, settings in all_settings.items():
+            location_filter = settings.get("locationFilter", {})
+            locations = location_filter.get("locations", []) if location_filter.get("enabled", False) else None
+            if not locations:
+                # Location filter disabled, or enabled with no locations selected - send all
+                location_unfiltered.add(user_key)
+            else:
+                for location in locations:
+                    if isinstance(location, str):
+                        location_users.setdefault(location, set()).add(user_key)
+
+            keywords = user_keywords.get(user_key) if settings.get("keywordFilter", {}).get("enabled", False) else None
+            if not keywords or "" in keywords:
+                # Keyword filter disabled, or enabled with no keywords set - send all.
+                # An empty keyword matches any post, so it also means "send all".
+                keyword_unfiltered.add(user_key)
+            else:
+                for keyword in keywords:
+                    keyword_users.setdefault(keyword.lower(), set()).add(user_key)
+
+        keyword_automaton = None
+        if ahocorasick is not None and keyword_users:
+            keyword_automaton = ahocorasick.Automaton()
+            for keyword in keyword_users:
+                keyword_automaton.add_word(keyword, keyword)
+            keyword_automaton.make_automaton()
+
+        return _MatchIndex(
+            location_unfiltered=frozenset(location_unfiltered),
+            location_users=location_users,
+            keyword_unfiltered=frozenset(keyword_unfiltered),
+            keyword_users=keyword_users,
+            all_users=frozenset(all_settings),
+            keyword_automaton=keyword_automaton,
+        )
 
     def get_user_notification_count(self, user_id: str, unread_only: bool = True) -> int:
         """Get count of notifications for a specific user."""
@@ -582,4 +792,7 @@ class NotificationService:
         Returns:
             Dict[str, int]: Number of records cleaned up from each table
         """
-        return self.db.cleanup_user_data(user_id)
+        try:
+            return self.db.cleanup_user_data(user_id)
+        finally:
+            self.invalidate(user_id)
@@ -1,10 +1,12 @@
 """Content parser for blog posts using BeautifulSoup."""
 
+import functools
+import html
 import logging
 import re
 from datetime import datetime, timezone
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from dateutil import parser as date_parser
 
 from app.core.config import Config
@@ -12,19 +14,88 @@ from app.db.models import Post
 
 logger = logging.getLogger(__name__)
 
+# Only post blocks are built into the tree; everything else on the page is skipped while parsing
+_ONE_BLOCK_RE = re.compile(r"^one_block")
+_POST_BLOCKS = SoupStrainer("div", class_=_ONE_BLOCK_RE)
+
+_META_RE = re.compile(r"(Local|Global)\s*-\s*([^-]+)\s*-\s*([^-]+)\s*-\s*([^(]+)\s*\(([^)]+)\)")
+_DATE_FALLBACK_RE = re.compile(r"\(([^)]*\d{4}[^)]*)\)")
+_LIKES_RE = re.compile(r"(\d+)\s*like")
+_COMMENTS_RE = re.compile(r"(\d+)\s*comment")
+_TAG_RE = re.compile(r"<[^>]+>")
+_YEAR_RE = re.compile(r"\b(20\d{2})\b")
+
+# Common date formats found in blog posts
+_DATE_FORMATS = (
+    "%B %d, %Y",  # January 1, 2025
+    "%b %d, %Y",  # Jan 1, 2025
+    "%m/%d/%Y",  # 01/01/2025
+    "%d/%m/%Y",  # 01/01/2025
+    "%Y-%m-%d",  # 2025-01-01
+    "%d.%m.%Y",  # 01.01.2025
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_fixed_format(date_str: str) -> datetime | None:
+    """
+    Parse ``date_str`` with the known blog date formats, or return None if none matches.
+
+    Results only depend on ``date_str``, so they are memoized across polls.
+    """
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_date_string(date_str: str) -> datetime | None:
+    """Parse a stripped date string into a UTC datetime, or None if nothing matches."""
+    dt = _parse_fixed_format(date_str)
+    if dt is not None:
+        return dt
+
+    # Not cached: dateutil fills missing fields from the current date ("10:30" means today)
+    try:
+        dt = date_parser.parse(date_str, fuzzy=True)
+        # Normalize to UTC; assume UTC if no tz info present
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    except (ValueError, TypeError):
+        pass
+
+    # If no format matches, try to extract year and create a basic date
+    year_match = _YEAR_RE.search(date_str)
+    if year_match:
+        try:
+            year = int(year_match.group(1))
+            return datetime(year, 1, 1, tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    return None
+
 
 class ContentParser:
     """Parses HTML content to extract blog posts."""
 
-    def parse_html_content(self, html_content: str) -> list[Post]:
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        # Base for the relative post and image links found on the page
+        self._blog_url = (Config.BLOG_API_URL or "").rstrip("/")
+
+    def parse_html_content(self, html_content: str | bytes) -> list[Post]:
         """Parse HTML content to extract posts."""
         if not html_content or not html_content.strip():
             logger.warning("Empty HTML content provided")
             return []
 
         posts = []
-        soup = BeautifulSoup(html_content, "html.parser")
-        post_blocks = soup.find_all("div", class_=lambda c: c and c.startswith("one_block"))
+        soup = BeautifulSoup(html_content, "lxml", parse_only=_POST_BLOCKS)
+        post_blocks = soup.find_all("div", class_=_ONE_BLOCK_RE)
 
         logger.debug("Found %d post blocks", len(post_blocks))
 
@@ -53,19 +124,22 @@ class ContentParser:
                 return None
 
             post_id = tooltip_div.get("id").lstrip("c")
-            title = self._clean_text(tooltip_div.find("h5").get_text())
-            content_preview = self._clean_text(tooltip_div.find("span").get_text())
+            # .string skips the recursive text walk when the tag holds plain text only
+            h5, span = tooltip_div.h5, tooltip_div.span
+            title = self._clean_text(h5.string or h5.get_text())
+            content_preview = self._clean_text(span.string or span.get_text())
 
             link_tag = block.find("a", onmouseover=True)
-            blog_url = Config.BLOG_API_URL.rstrip("/")
-            link = f"{blog_url}/{link_tag['href'].lstrip('/')}" if link_tag and link_tag.has_attr("href") else ""
+            link = f"{self._blog_url}/{link_tag['href'].lstrip('/')}" if link_tag and link_tag.has_attr("href") else ""
 
             is_urgent = bool(block.find(class_="urgent"))
 
-            location, department, category, publish_date = self._extract_metadata(block)
+            # Serialize the block's text once for both the metadata and engagement patterns
+            text = block.get_text(separator=" ").strip()
+            location, department, category, publish_date = self._extract_metadata(text)
 
             has_image, image_url = self._extract_image_info(block)
-            likes, comments = self._extract_engagement_metrics(block)
+            likes, comments = self._extract_engagement_metrics(text.lower())
 
             # Convert publish_date string to datetime object
             publish_date_obj = self._parse_date(publish_date)
@@ -90,14 +164,9 @@ class ContentParser:
             logger.error("Error parsing post block: %s", e)
             return None
 
-    def _extract_metadata(self, block) -> tuple:
-        """Extract location, department, category, and publish date."""
-        text = block.get_text(separator=" ").strip()
-
-        meta_match = re.search(
-            r"(Local|Global)\s*-\s*([^-]+)\s*-\s*([^-]+)\s*-\s*([^(]+)\s*\(([^)]+)\)",
-            text,
-        )
+    def _extract_metadata(self, text: str) -> tuple:
+        """Extract location, department, category, and publish date from the block's text."""
+        meta_match = _META_RE.search(text)
 
         if meta_match:
             location = self._clean_text(meta_match.group(2))
@@ -107,7 +176,7 @@ class ContentParser:
             return location, department, category, publish_date
 
         # Fallback if format changes
-        date_match = re.search(r"\(([^)]*\d{4}[^)]*)\)", text)
+        date_match = _DATE_FALLBACK_RE.search(text)
         publish_date = self._clean_text(date_match.group(1)) if date_match else "Unknown"
 
         return "Unknown", "", "", publish_date
@@ -116,15 +185,14 @@ class ContentParser:
         """Extract image information."""
         image_link = block.find("a", class_="fancybox image")
         if image_link and image_link.has_attr("href"):
-            full_url = f"{Config.BLOG_API_URL.rstrip('/')}/{image_link['href'].lstrip('/')}"
+            full_url = f"{self._blog_url}/{image_link['href'].lstrip('/')}"
             return True, full_url
         return False, ""
 
-    def _extract_engagement_metrics(self, block) -> tuple:
-        """Extract likes and comments count."""
-        text = block.get_text(" ").lower()
-        likes_match = re.search(r"(\d+)\s*like", text)
-        comments_match = re.search(r"(\d+)\s*comment", text)
+    def _extract_engagement_metrics(self, text: str) -> tuple:
+        """Extract likes and comments count from the block's lowercased text."""
+        likes_match = _LIKES_RE.search(text)
+        comments_match = _COMMENTS_RE.search(text)
 
         likes = int(likes_match.group(1)) if likes_match else 0
         comments = int(comments_match.group(1)) if comments_match else 0
@@ -137,16 +205,10 @@ class ContentParser:
             return ""
 
         # Remove stray HTML tags (paranoid safety if text comes from .get_text() usually clean)
-        text = re.sub(r"<[^>]+>", "", text)
+        text = _TAG_RE.sub("", text)
 
-        # Decode HTML entities (can also use html.unescape for more comprehensive decoding)
-        text = (
-            text.replace("&amp;", "&")
-            .replace("&lt;", "<")
-            .replace("&gt;", ">")
-            .replace("&quot;", '"')
-            .replace("&#39;", "'")
-        )
+        # Decode HTML entities
+        text = html.unescape(text)
 
         return " ".join(text.split()).strip()
 
@@ -155,42 +217,12 @@ class ContentParser:
         if not date_str or date_str == "Unknown":
             return datetime.now(timezone.utc)
 
-        # Common date formats found in blog posts
-        date_formats = [
-            "%B %d, %Y",  # January 1, 2025
-            "%b %d, %Y",  # Jan 1, 2025
-            "%m/%d/%Y",  # 01/01/2025
-            "%d/%m/%Y",  # 01/01/2025
-            "%Y-%m-%d",  # 2025-01-01
-            "%d.%m.%Y",  # 01.01.2025
-        ]
-
         # Clean the date string
         date_str = date_str.strip()
 
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).replace(tzinfo=timezone.utc)
-            except ValueError:
-                continue
-
-        try:
-            dt = date_parser.parse(date_str, fuzzy=True)
-            # Normalize to UTC; assume UTC if no tz info present
-            if dt.tzinfo is None:
-                return dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
-        except (ValueError, TypeError):
-            pass
-
-        # If no format matches, try to extract year and create a basic date
-        year_match = re.search(r"\b(20\d{2})\b", date_str)
-        if year_match:
-            try:
-                year = int(year_match.group(1))
-                return datetime(year, 1, 1, tzinfo=timezone.utc)
-            except ValueError:
-                pass
+        parsed = _parse_date_string(date_str)
+        if parsed:
+            return parsed
 
         # Fallback to current datetime
         logger.warning("Could not parse date '%s', using current datetime", date_str)
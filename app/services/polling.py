@@ -18,6 +18,7 @@ Workflow:
 5. Handle errors gracefully with retry logic
 """
 
+import hashlib
 import logging
 import threading
 import time
@@ -25,10 +26,12 @@ from datetime import datetime, timezone
 from functools import wraps
 from typing import TYPE_CHECKING, Any
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
 
 from app.core.config import Config
-from app.db.database import DatabaseManager
+from app.db.database import DatabaseError, DatabaseManager
 from app.db.models import Post
 from app.services.parser import ContentParser
 from app.utils.http_client import BlogClient, HTTPClientError
@@ -44,32 +47,46 @@ logger = logging.getLogger(__name__)
 
 
 def rate_limit(calls: int, period: int) -> Any:
-    """Decorator to limit the number of calls per time period."""
+    """Decorator to limit the number of calls per time period.
+
+    The wrapped function gains a ``would_wait()`` attribute reporting, without using up
+    a slot, whether a call made now would have to wait for the next period."""
+    period_ns = int(period * 1_000_000_000)
 
     def decorator(func: Any) -> Any:
-        last_reset = time.time()
+        # Monotonic clock: NTP steps or manual clock changes cannot reset or stretch the window
+        window_start = time.monotonic_ns()
         calls_made = 0
         lock = threading.Lock()
 
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            nonlocal last_reset, calls_made
+            nonlocal window_start, calls_made
+            # Reserve a slot under the lock, but sleep outside it so waiting callers
+            # do not hold up each other's bookkeeping
             with lock:
-                now = time.time()
-                if now - last_reset >= period:
-                    last_reset = now
+                now = time.monotonic_ns()
+                if now - window_start >= period_ns:
+                    window_start = now
                     calls_made = 0
 
                 if calls_made >= calls:
-                    sleep_time = period - (now - last_reset)
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                    last_reset = time.time()
+                    # Current window is full: take a slot in the next one
+                    window_start += period_ns
                     calls_made = 0
 
                 calls_made += 1
+                wait_ns = window_start - now
+            if wait_ns > 0:
+                time.sleep(wait_ns / 1_000_000_000)
             return func(*args, **kwargs)
 
+        def would_wait() -> bool:
+            with lock:
+                now = time.monotonic_ns()
+                return window_start > now or (now - window_start < period_ns and calls_made >= calls)
+
+        wrapper.would_wait = would_wait
         return wrapper
 
     return decorator
@@ -79,6 +96,7 @@ class PollingService:
     """Continuously polls a blog for new posts and records notifications."""
 
     SCHEDULER_NAME = "polling_service"
+    KNOWN_POSTS_LIMIT = 500
 
     def __init__(
         self,
@@ -100,6 +118,10 @@ class PollingService:
         self.parser = content_parser
         self.notifier = notification_service
         self.interval = interval_minutes * 60
+        # Adaptive polling: shortened right after new posts, doubled (capped) while the blog is idle
+        self._min_interval = max(60, self.interval // 4)
+        self._max_interval = self.interval * 4
+        self._current_interval = self.interval
 
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
@@ -107,12 +129,15 @@ class PollingService:
         self.rate_limit_calls = rate_limit_calls
         self.rate_limit_period = rate_limit_period
 
-        self._lock = threading.Lock()
-        self._last_poll_time: datetime = None
+        self._last_poll_epoch: float | None = None
         self._last_error = None
-        self._is_polling = False
+        # Set while a poll is in flight; the scheduler's max_instances=1 keeps polls from overlapping
+        self._polling = threading.Event()
         self._retry_count = 0
         self._last_manual_poll: float = 0.0
+        self._last_html_digest: bytes | None = None
+        # Post ID -> (title, content) of recently stored posts, loaded lazily and kept across polls
+        self._known_posts: dict[str, tuple[str, str]] | None = None
         self.scheduler = BackgroundScheduler(daemon=True)
 
     def start(self) -> None:
@@ -121,19 +146,32 @@ class PollingService:
             logger.warning("Polling service is already running")
             return
 
-        # Allow some tolerance for delayed execution to avoid missed runs
+        # A late tick within one interval still runs, but any backlog collapses into a single poll and
+        # older fires are dropped; manual_poll() is the way to force a catch-up
         self.scheduler.add_job(
             self._poll_job,
             "interval",
-            seconds=self.interval,
+            seconds=self._current_interval,
             id=self.SCHEDULER_NAME,
-            misfire_grace_time=max(60, self.interval // 2),
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=self.interval,
         )
+        # Expired data only needs purging once a day, off-peak; separate jobs so a slow
+        # token purge never holds up notification cleanup
         self.scheduler.add_job(
-            self._cleanup_job,
-            "interval",
-            seconds=self.interval * 2,
-            misfire_grace_time=max(60, self.interval),
+            self._cleanup_notifications_job,
+            CronTrigger(hour=Config.CLEANUP_HOUR, minute=0),
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600,
+        )
+        self.scheduler.add_job(
+            self._cleanup_tokens_job,
+            CronTrigger(hour=Config.CLEANUP_HOUR, minute=30),
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600,
         )
         self.scheduler.start()
         logger.info("Polling service started")
@@ -147,31 +185,45 @@ class PollingService:
     def _poll_job(self) -> None:
         """Scheduled job to poll once and send notifications."""
         try:
+            # New posts are stored and notified inside _poll_once
             new_posts = self._poll_once()
-            if new_posts and self.notifier:
-                # Create notifications for each new post
-                notifications = self.notifier.create_bulk_notification(new_posts)
-                logger.info(
-                    "Created %d notifications for %d new posts",
-                    len(notifications),
-                    len(new_posts),
-                )
             self._last_error = ""
             self._retry_count = 0
-        except (HTTPClientError, ValueError, TypeError) as e:
+            self._adapt_interval(bool(new_posts))
+        except (HTTPClientError, DatabaseError) as e:
             self._last_error = str(e)
             logger.error("Polling failed: %s", e)
 
-    def _cleanup_job(self) -> None:
-        """Scheduled job to clean up expired data."""
+    def _adapt_interval(self, had_new_posts: bool) -> None:
+        """Poll more often after activity and back off while nothing new appears."""
+        interval = self._min_interval if had_new_posts else min(self._current_interval * 2, self._max_interval)
+        if interval == self._current_interval:
+            return
+        self._current_interval = interval
+        try:
+            self.scheduler.reschedule_job(self.SCHEDULER_NAME, trigger="interval", seconds=interval)
+            logger.debug("Polling interval set to %d seconds", interval)
+        except JobLookupError:
+            logger.debug("Polling job not scheduled; interval change to %d seconds deferred", interval)
+
+    def _cleanup_notifications_job(self) -> None:
+        """Scheduled job to remove expired notifications."""
         try:
             removed = self.db.cleanup_expired_notifications()
             logger.debug("Expired notifications removed: %d", removed)
+            # Off-peak and right after the day's bulk deletes: a good time to refresh planner stats
+            self.db.optimize()
+        except (ValueError, TypeError, RuntimeError) as e:
+            logger.error("Notification cleanup failed: %s", e)
+
+    def _cleanup_tokens_job(self) -> None:
+        """Scheduled job to purge old auth tokens."""
+        try:
             purged = self.db.cleanup_old_tokens(Config.AUTH_TOKEN_TTL_DAYS)
             if purged:
                 logger.debug("Old auth tokens purged: %d", purged)
         except (ValueError, TypeError, RuntimeError) as e:
-            logger.error("Cleanup failed: %s", e)
+            logger.error("Token cleanup failed: %s", e)
 
     @rate_limit(calls=10, period=60)
     def _poll_once(self) -> list[Post]:
@@ -180,46 +232,68 @@ class PollingService:
         Returns a list of new posts that were added to the database."""
 
         logger.debug("Starting single poll iteration")
-        with self._lock:
-            if self._is_polling:
-                return []
-            self._is_polling = True
+        if self._polling.is_set():
+            return []
+        self._polling.set()
 
         new_posts: list[Post] = []
         try:
             html = self.client.get_content()
+            # A 304 hands back the cached body, and servers without validators often serve
+            # byte-identical pages; either way there is nothing new to parse
+            digest = hashlib.blake2b(html, digest_size=16).digest()
+            if digest == self._last_html_digest:
+                self._last_poll_epoch = time.time()
+                return new_posts
             posts = self.parser.parse_html_content(html)
-            self._last_poll_time = datetime.now(timezone.utc)
+            self._last_poll_epoch = time.time()
             if posts:
                 new_posts = self._process_posts(posts)
+            # Only remember the page once its posts are stored, so a failed poll is retried
+            self._last_html_digest = digest
         finally:
-            self._is_polling = False
+            self._polling.clear()
         return new_posts
 
     def _process_posts(self, posts: list[Post]) -> list[Post]:
         """Insert only new posts and create notifications for them.
 
         Returns a list of posts that were added."""
-        new_posts: list[Post] = []
-        added = self.db.add_posts_bulk(posts)
-        for post in added:
-            if post.id is None:
-                logger.warning("Skipping post with None id")
-                continue
-            logger.info("Added new post: %s", post.id)
-
-            # Create notification for each new post
-            if self.notifier:
-                try:
-                    notification = self.notifier.create_post_notification(post)
-                    if notification:
-                        logger.info("Created notification for post %s", post.id)
-                    else:
-                        logger.warning("Failed to create notification for post %s", post.id)
-                except (ValueError, TypeError, RuntimeError) as e:
-                    logger.exception("Error creating notification for post %s: %s", post.id, e)
-
-            new_posts.append(post)
+        # Only hand the DB posts that are new or changed since we last stored them
+        if self._known_posts is None:
+            self._known_posts = self.db.get_recent_post_fingerprints(self.KNOWN_POSTS_LIMIT)
+        known = self._known_posts
+        candidates = [post for post in posts if known.get(post.id) != (post.title, post.content)]
+        if not candidates:
+            return []
+
+        added = self.db.add_posts_bulk(candidates)
+        known.update((post.id, (post.title, post.content)) for post in added)
+        if len(known) > 2 * self.KNOWN_POSTS_LIMIT:
+            # Reload a fresh recent window next time rather than growing without bound
+            self._known_posts = None
+        new_posts = [post for post in added if post.id is not None]
+        if len(new_posts) != len(added):
+            logger.warning("Skipping %d posts with None id", len(added) - len(new_posts))
+        if new_posts:
+            logger.info("Added %d new posts", len(new_posts))
+
+        # Create notifications for all new posts in one batch
+        if self.notifier and new_posts:
+            try:
+                notifications = self.notifier.create_bulk_notification(new_posts)
+                logger.info("Created %d notifications for %d new posts", len(notifications), len(new_posts))
+            except DatabaseError:
+                # The posts are already committed and count as unchanged from now on, so these
+                # notifications are not retried; name the lost batch for manual follow-up
+                logger.error(
+                    "Notifications lost for %d stored posts: %s",
+                    len(new_posts),
+                    ", ".join(post.id for post in new_posts),
+                )
+                raise
+            except (ValueError, TypeError, RuntimeError) as e:
+                logger.exception("Error creating notifications for %d new posts: %s", len(new_posts), e)
 
         return new_posts
 
@@ -230,6 +304,15 @@ class PollingService:
             logger.error("No polling job found with id %s", self.SCHEDULER_NAME)
             return
 
+        if self._polling.is_set():
+            logger.info("Manual poll skipped: a poll is already in progress")
+            return
+
+        # Don't park a scheduler thread in the rate limiter's sleep for a manual request
+        if self._poll_once.would_wait():
+            logger.info("Manual poll skipped: polling rate limit reached")
+            return
+
         try:
             job.modify(next_run_time=datetime.now(timezone.utc))
             logger.info("Manual poll scheduled")
@@ -241,7 +324,11 @@ class PollingService:
         """Return current status of the polling service."""
         return {
             "is_running": self.scheduler.running,
-            "last_poll": (self._last_poll_time.isoformat() if self._last_poll_time else None),
+            "last_poll": (
+                datetime.fromtimestamp(self._last_poll_epoch, tz=timezone.utc).isoformat()
+                if self._last_poll_epoch is not None
+                else None
+            ),
             "last_error": self._last_error,
-            "is_polling": self._is_polling,
+            "is_polling": self._polling.is_set(),
         }
@@ -1,6 +1,7 @@
 """HTTP client utilities for making requests with session management."""
 
 import logging
+import threading
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
@@ -22,6 +23,47 @@ logger = logging.getLogger(__name__)
 class HTTPClientError(Exception):
     """Base exception for HTTP client errors."""
 
+    def __init__(self, message: str, *, status_code: int | None = None, url: str | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.url = url
+
+
+# Connection pools shared by all clients talking to the same origin with the same retry policy,
+# so keep-alive connections (and their TLS sessions) survive across client instances
+_SHARED_ADAPTERS: dict[tuple[str, str, int, float], HTTPAdapter] = {}
+_SHARED_ADAPTERS_LOCK = threading.Lock()
+
+
+def _retry_policy(max_retries: int, backoff_factor: float) -> Retry:
+    """Retry idempotent requests on transient statuses, honouring the server's Retry-After."""
+    return Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        # Hand the final response to _handle_response instead of raising a RetryError
+        raise_on_status=False,
+    )
+
+
+def _shared_adapter(origin: tuple[str, str], max_retries: int, backoff_factor: float) -> HTTPAdapter:
+    """Return the pooled adapter for ``origin`` (scheme, host), creating it on first use."""
+    key = (*origin, max_retries, backoff_factor)
+    with _SHARED_ADAPTERS_LOCK:
+        adapter = _SHARED_ADAPTERS.get(key)
+        if adapter is None:
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                pool_block=True,
+                max_retries=_retry_policy(max_retries, backoff_factor),
+            )
+            _SHARED_ADAPTERS[key] = adapter
+        return adapter
+
 
 class HTTPClient:
     """HTTP client with connection pooling, session persistence, and retry logic."""
@@ -46,21 +88,28 @@ class HTTPClient:
         self._auth_provider = auth_provider
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
+        self._parsed_base = urlparse(self.base_url)
+        # Last credentials applied and the headers they produced; reused while the provider's answer is unchanged
+        self._auth_cache_creds: Any = None
+        self._auth_cache_headers: dict[str, str] = {}
+        # url -> (etag, last_modified, body) of the last full response, for conditional GETs
+        self._validators: dict[str, tuple[str, str, bytes]] = {}
 
         # Create a persistent session with retry strategy
         self.session = requests.Session()
 
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=self._max_retries,
-            backoff_factor=self._backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Configure retry strategy; requests to the blog origin go through its shared pool
+        adapter = HTTPAdapter(max_retries=_retry_policy(self._max_retries, self._backoff_factor))
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        parsed = self._parsed_base
+        if parsed.scheme and parsed.netloc:
+            self.session.mount(
+                f"{parsed.scheme}://{parsed.netloc}",
+                _shared_adapter((parsed.scheme, parsed.netloc), self._max_retries, self._backoff_factor),
+            )
 
-        # Set default headers
+        # Set default headers once; they never change after construction
         self._update_headers()
 
     def _update_headers(self) -> None:
@@ -78,32 +127,35 @@ class HTTPClient:
 
     def _apply_auth(self, headers: dict[str, str]) -> dict[str, str]:
         """Apply blog API authentication if configured."""
-        if not self._auth_provider:
+        creds = self._auth_provider() if self._auth_provider else None
+        if creds is None:
+            self._auth_cache_creds = None
+            self._auth_cache_headers = {}
             self.session.auth = None
             return headers
 
-        creds = self._auth_provider()
-        if creds is None:
-            self.session.auth = None
+        # Same token/cookie descriptor as last time: session auth and cookies are already in place
+        if creds == self._auth_cache_creds:
+            headers.update(self._auth_cache_headers)
             return headers
 
+        auth_headers: dict[str, str] = {}
         if isinstance(creds, HttpNtlmAuth):
             self.session.auth = creds
         elif isinstance(creds, str):
-            headers["Authorization"] = f"Bearer {creds}"
+            auth_headers["Authorization"] = f"Bearer {creds}"
             self.session.auth = None
         elif isinstance(creds, dict):
             # Support cookie and header based auth via dict
             # Optional custom headers
             custom_headers = creds.get("headers")
             if isinstance(custom_headers, dict):
-                headers.update({str(k): str(v) for k, v in custom_headers.items()})
+                auth_headers.update({str(k): str(v) for k, v in custom_headers.items()})
 
             # Optional cookie injection
             cookie_map = creds.get("cookies")
             if isinstance(cookie_map, dict) and cookie_map:
-                parsed = urlparse(self.base_url)
-                domain = creds.get("domain") or parsed.hostname
+                domain = creds.get("domain") or self._parsed_base.hostname
                 path = creds.get("path", "/")
                 for cname, cval in cookie_map.items():
                     self._set_cookie_safely(cname, cval, domain=domain, path=path)
@@ -112,6 +164,9 @@ class HTTPClient:
             logger.warning("Unsupported blog auth credentials: %s", type(creds))
             self.session.auth = None
 
+        self._auth_cache_creds = creds
+        self._auth_cache_headers = auth_headers
+        headers.update(auth_headers)
         return headers
 
     def _build_url(self, path: str) -> str:
@@ -132,30 +187,29 @@ class HTTPClient:
                 exc,
             )
 
-    def _handle_response(self, response: requests.Response) -> str:
+    def _handle_response(self, response: requests.Response) -> bytes:
         """Handle HTTP response and raise appropriate exceptions."""
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
+            # Blocking and rate limiting are expected operating conditions; no traceback needed
             if response.status_code == 403:
                 error_msg = f"Access forbidden (403) - the server is blocking our requests. URL: {response.url}"
-                logger.exception(error_msg)
+                logger.warning(error_msg)
                 logger.info("Try using a VPN or different network if this persists")
             elif response.status_code == 429:
                 error_msg = f"Rate limited (429) - too many requests. URL: {response.url}"
-                logger.exception(error_msg)
+                logger.warning(error_msg)
             else:
                 error_msg = f"HTTP {response.status_code} error: {e}"
                 logger.exception(error_msg)
-            raise HTTPClientError(error_msg) from e
+            raise HTTPClientError(error_msg, status_code=response.status_code, url=response.url) from e
 
-        # Check if response has content
-        if not response.text.strip():
+        # Raw bytes go straight to the parser, which detects the encoding itself
+        content = response.content
+        if not content:
             logger.warning("Received empty response")
-            return ""
-
-        # Return response text if successful
-        return response.text
+        return content
 
     def get(
         self,
@@ -163,35 +217,52 @@ class HTTPClient:
         headers: dict[str, str] | None = None,
         timeout: int | None = None,
         params: dict[str, Any] | None = None,
-    ) -> str:
-        """Make GET request."""
+    ) -> bytes:
+        """Make GET request and return the raw response body."""
         url = self._build_url(path) if path else self.base_url
 
-        # Refresh default headers before each request
-        self._update_headers()
-
-        request_headers = self.session.headers.copy()
-        if headers:
-            request_headers.update(headers)
+        # Only per-request extras go here; requests merges them over the session defaults
+        request_headers = dict(headers) if headers else {}
 
         # Apply authentication if configured
         request_headers = self._apply_auth(request_headers)
 
+        # Revalidate the last body we saw for this URL instead of downloading it again
+        cached = self._validators.get(url) if params is None else None
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers.setdefault("If-None-Match", etag)
+            if last_modified:
+                request_headers.setdefault("If-Modified-Since", last_modified)
+
         try:
             response = self.session.get(
                 url,
-                headers=request_headers,
+                headers=request_headers or None,
                 timeout=timeout or self.timeout,
                 params=params,
             )
-            return self._handle_response(response)
+            if cached and response.status_code == 304:
+                logger.debug("Content not modified: %s", url)
+                return cached[2]
+            body = self._handle_response(response)
         except requests.exceptions.RequestException as e:
             error_msg = f"GET request failed: {e}"
             logger.exception(error_msg)
             raise HTTPClientError(error_msg) from e
 
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        if params is None and body and (etag or last_modified):
+            self._validators[url] = (etag, last_modified, body)
+        else:
+            self._validators.pop(url, None)
+        return body
+
     def close(self) -> None:
         """Close the session and release resources."""
+        # Closing a shared adapter only drops its idle connections; other clients reconnect on demand
         self.session.close()
 
 
@@ -207,10 +278,11 @@ class BlogClient(HTTPClient):
         self,
         path: str = "",
         headers: dict[str, str] | None = None,
-    ) -> str:
-        """Get HTML content from the blog."""
+    ) -> bytes:
+        """Get raw HTML content from the blog."""
         try:
             return self.get(path=path, headers=headers)
         except HTTPClientError as e:
-            logger.exception("Failed to get HTML source: %s", e)
+            # Details (and any traceback) were logged where the error was raised
+            logger.error("Failed to get HTML source: %s", e)
             raise
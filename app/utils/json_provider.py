@@ -0,0 +1,31 @@
+"""Flask JSON provider backed by orjson."""
+
+from typing import Any
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serve ``jsonify`` and ``request.get_json`` with orjson.
+
+    Datetimes still go through Flask's ``default`` so they keep the HTTP date format, and keys
+    are sorted while ``sort_keys`` is set, as with the stdlib provider.
+    Calls asking for options orjson cannot express (e.g. ``indent`` in debug mode, or
+    ``tojson`` arguments) fall back to the stdlib implementation.
+    """
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize ``obj`` to a compact JSON string."""
+        if kwargs.keys() - {"separators"}:
+            return super().dumps(obj, **kwargs)
+        option = self._OPTIONS | orjson.OPT_SORT_KEYS if self.sort_keys else self._OPTIONS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize JSON text or UTF-8 bytes."""
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
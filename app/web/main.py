@@ -1,12 +1,18 @@
 """Main entry point for the Flask web application."""
 
+import atexit
 import logging
 import os
+import queue
+import re
+import signal
+import sys
+import threading
 from logging import Formatter
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
-from flask import Flask, Response, jsonify, request, session
+from flask import Flask, Response, jsonify, request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_wtf import CSRFProtect
@@ -17,12 +23,22 @@ from app.api.routes.dashboard_bp import limiter as dashboard_limiter
 from app.core.blog_security import BlogAuthentication
 from app.core.config import config
 from app.core.security import AuthService
-from app.core.utils.session_utils import access_token_storage, require_auth
+from app.core.utils.session_utils import access_token_storage, get_user_key, require_auth
 from app.db.database import DatabaseManager
 from app.services.notification import NotificationService
 from app.services.parser import ContentParser
 from app.services.polling import PollingService
 from app.utils.http_client import BlogClient
+from app.utils.json_provider import OrjsonProvider
+
+# Longest push endpoint URL accepted from clients; real push service URLs are well below this
+MAX_ENDPOINT_LENGTH = 2048
+# Push services only hand out HTTPS endpoint URLs of printable ASCII
+_ENDPOINT_RE = re.compile(r"https://[A-Za-z0-9.\-]{1,253}(?::\d{1,5})?/[\x21-\x7e]*")
+# Encryption keys every push subscription must carry
+_SUBSCRIPTION_KEYS = frozenset(("p256dh", "auth"))
+# Endpoints whose responses default to Cache-Control: no-store
+_NO_STORE_ENDPOINTS = frozenset(("manage_subscription", "remove_subscription", "notify"))
 
 
 def setup_logging(log_path: str = "app.log") -> None:
@@ -34,13 +50,23 @@ def setup_logging(log_path: str = "app.log") -> None:
     env = os.getenv("FLASK_ENV", "default").lower()
     root.setLevel(logging.DEBUG if env in ("development", "default") else logging.INFO)
 
+    # No formatter uses thread/process fields, so skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     console = logging.StreamHandler()
     console.setFormatter(log_formatter)
-    root.addHandler(console)
 
     file_handler = RotatingFileHandler(log_path, maxBytes=2 * 1024 * 1024, backupCount=5)
     file_handler.setFormatter(log_formatter)
-    root.addHandler(file_handler)
+
+    # Request threads only enqueue records; a background listener does the console/file I/O and rotation
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
 
 def create_app(config_name: str = "default") -> Flask:
@@ -48,6 +74,7 @@ def create_app(config_name: str = "default") -> Flask:
     setup_logging()
 
     flask_app = Flask(__name__)
+    flask_app.json = OrjsonProvider(flask_app)
 
     # Secure session cookie configuration
     flask_app.config.update(
@@ -62,10 +89,17 @@ def create_app(config_name: str = "default") -> Flask:
 
     CSRFProtect(flask_app)
 
-    # For production, configure Flask-Limiter to use a Redis storage backend
-    # via RATE_LIMIT_STORAGE_URL environment variable.
+    # Load and validate config
+    config_cls = config.get(config_name, config["default"])
+    flask_app.config.from_object(config_cls)
+    try:
+        config_cls.validate()
+    except ValueError as err:
+        flask_app.logger.exception("Configuration validation failed: %s", err)
+        raise
 
-    # Initialize rate limiter
+    # Initialize rate limiters after the config is loaded: both read their storage backend
+    # and strategy from RATELIMIT_STORAGE_URI / RATELIMIT_STRATEGY
     limiter = Limiter(
         app=flask_app,
         key_func=get_remote_address,
@@ -75,15 +109,6 @@ def create_app(config_name: str = "default") -> Flask:
     # Initialize dashboard limiter
     dashboard_limiter.init_app(flask_app)
 
-    # Load and validate config
-    config_cls = config.get(config_name, config["default"])
-    flask_app.config.from_object(config_cls)
-    try:
-        config_cls.validate()
-    except ValueError as err:
-        flask_app.logger.exception("Configuration validation failed: %s", err)
-        raise
-
     # Prepare database path
     db_path = flask_app.config["APP_DATABASE_PATH"]
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -98,6 +123,8 @@ def create_app(config_name: str = "default") -> Flask:
     )
     blog_auth = BlogAuthentication()
     db_manager = DatabaseManager(db_path)
+    # Buffered subscription last_used timestamps must not be lost on shutdown
+    atexit.register(db_manager.flush_subscription_last_used)
     parser = ContentParser()
     http_client = BlogClient(
         base_url=flask_app.config["BLOG_API_URL"],
@@ -139,6 +166,10 @@ def create_app(config_name: str = "default") -> Flask:
         response.headers.setdefault("X-Frame-Options", "DENY")
         response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
 
+        # Personalised push API responses must never be reused by browsers or intermediaries
+        if request.endpoint in _NO_STORE_ENDPOINTS:
+            response.headers.setdefault("Cache-Control", "no-store")
+
         # Content Security Policy (allow required CDNs used by templates)
         csp = (
             "default-src 'self'; "
@@ -175,13 +206,22 @@ def create_app(config_name: str = "default") -> Flask:
         flask_app.logger.info("Stopping polling service via CLI")
         poller.stop()
 
-    # Push subscription endpoints
+    # Push subscription endpoints; route bodies use the services captured above directly
+    log = flask_app.logger
+    # endpoint -> set once the request currently storing that subscription finishes
+    inflight_subscriptions: dict[str, threading.Event] = {}
+    inflight_lock = threading.Lock()
+
     def _validate_subscription(data: dict) -> bool:
+        # Cheap shape checks first; oversized endpoints are rejected before any lookup
+        endpoint = data.get("endpoint") if isinstance(data, dict) else None
+        keys = data.get("keys") if isinstance(data, dict) else None
         return (
-            isinstance(data, dict)
-            and "endpoint" in data
-            and "keys" in data
-            and all(k in data["keys"] for k in ("p256dh", "auth"))
+            isinstance(endpoint, str)
+            and 0 < len(endpoint) <= MAX_ENDPOINT_LENGTH
+            and _ENDPOINT_RE.fullmatch(endpoint) is not None
+            and isinstance(keys, dict)
+            and _SUBSCRIPTION_KEYS.issubset(keys)
         )
 
     @flask_app.route("/api/subscriptions", methods=["POST"])
@@ -193,23 +233,33 @@ def create_app(config_name: str = "default") -> Flask:
         if not _validate_subscription(sub):
             return jsonify({"error": "Invalid subscription object"}), 400
 
-        user = session.get("user") or {}
-        user_key = user.get("preferred_username") or user.get("name")
+        user_key = get_user_key()
         if not user_key:
             return jsonify({"error": "Unauthorized"}), 401
 
-        if flask_app.database_manager.push_subscription_exists(sub["endpoint"], user_key):
-            flask_app.database_manager.update_subscription_last_used(sub["endpoint"])
-            flask_app.logger.info(
-                "Subscription already exists: %s | user=%s",
-                sub["endpoint"],
-                user_key,
-            )
-            return jsonify({"message": "Subscription already active"}), 200
+        # Browsers re-post the same subscription from every tab at once; let the first request
+        # do the write and have concurrent duplicates wait for it, then find it cached
+        endpoint = sub["endpoint"]
+        with inflight_lock:
+            pending = inflight_subscriptions.get(endpoint)
+            if pending is None:
+                inflight_subscriptions[endpoint] = threading.Event()
+        if pending is not None:
+            pending.wait(timeout=5)
 
-        flask_app.database_manager.add_push_subscription(sub, user_key)
-        flask_app.logger.info("Subscription added: %s | user=%s", sub["endpoint"], user_key)
-        return jsonify({"message": "Subscription successful"}), 201
+        try:
+            if db_manager.push_subscription_exists(endpoint, user_key):
+                db_manager.update_subscription_last_used(endpoint)
+                log.info("Subscription already exists: %s | user=%s", endpoint, user_key)
+                return jsonify({"message": "Subscription already active"}), 200
+
+            db_manager.add_push_subscription(sub, user_key)
+            log.info("Subscription added: %s | user=%s", endpoint, user_key)
+            return jsonify({"message": "Subscription successful"}), 201
+        finally:
+            if pending is None:
+                with inflight_lock:
+                    inflight_subscriptions.pop(endpoint).set()
 
     @flask_app.route("/api/subscriptions", methods=["DELETE"])
     @require_auth
@@ -220,15 +270,16 @@ def create_app(config_name: str = "default") -> Flask:
             sub = request.get_json(silent=True)
             if not sub:
                 return jsonify({"error": "No subscription data"}), 400
-            if not _validate_subscription(sub):
+            # Only the endpoint is needed to delete; stored rows passed the full check when added
+            endpoint = sub.get("endpoint") if isinstance(sub, dict) else None
+            if not isinstance(endpoint, str) or not endpoint:
                 return jsonify({"error": "Invalid subscription object"}), 400
-            user = session.get("user") or {}
-            user_key = user.get("preferred_username") or user.get("name")
-            flask_app.database_manager.remove_push_subscription(sub, user_key=user_key)
-            flask_app.logger.info("Subscription removed: %s", sub.get("endpoint", "unknown"))
+            user_key = get_user_key()
+            db_manager.remove_push_subscription(sub, user_key=user_key)
+            log.info("Subscription removed: %s", sub.get("endpoint", "unknown"))
             return jsonify({"message": "Subscription removed"}), 200
         except (ValueError, TypeError, KeyError) as e:
-            flask_app.logger.exception("Deregister error: %s", e)
+            log.exception("Deregister error: %s", e)
             return jsonify({"error": str(e)}), 500
 
     @flask_app.route("/notify", methods=["GET"])
@@ -236,22 +287,35 @@ def create_app(config_name: str = "default") -> Flask:
     @limiter.limit("15 per minute")
     def notify() -> tuple[dict, int]:
         """Send a test notification to all push subscriptions."""
-        if flask_app.notification_service.create_test_notification():
-            flask_app.logger.info("Test notification sent successfully")
+        if notifier.create_test_notification():
+            log.info("Test notification sent successfully")
             return jsonify({"message": "Notification sent"}), 200
-        flask_app.logger.error("Failed to send test notification")
+        log.error("Failed to send test notification")
         return jsonify({"error": "Failed to send notification"}), 500
 
     flask_app.logger.info("Application initialized successfully")
     return flask_app
 
 
+def shutdown_services(flask_app: Flask) -> None:
+    """Stop background services and release their connections."""
+    if hasattr(flask_app, "polling_service"):
+        flask_app.polling_service.stop()
+    if hasattr(flask_app, "notification_service"):
+        flask_app.notification_service.close()
+    if hasattr(flask_app, "blog_client"):
+        flask_app.blog_client.close()
+
+
 if __name__ == "__main__":
     app = create_app(os.getenv("FLASK_ENV", "default"))
-    try:
-        pass  # Application runs via `flask run`
-    finally:
-        if hasattr(app, "polling_service"):
-            app.polling_service.stop()
-        if hasattr(app, "blog_client"):
-            app.blog_client.close()
+
+    def _handle_shutdown_signal(_signum: int, _frame: object) -> None:
+        shutdown_services(app)
+        sys.exit(0)
+
+    for shutdown_signal in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(shutdown_signal, _handle_shutdown_signal)
+
+    # The reloader would re-run create_app in a child process and start a second poller
+    app.run(use_reloader=False)
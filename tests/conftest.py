@@ -0,0 +1,66 @@
+"""Shared fixtures for the test suite."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Config reads the environment at import time, so it must be complete before the app is imported
+_DATA_DIR = tempfile.mkdtemp(prefix="notification-app-tests-")
+os.environ.update(
+    {
+        "SECRET_KEY": "test-secret",
+        "AAD_CLIENT_ID": "client-id",
+        "AAD_CLIENT_SECRET": "client-secret",
+        "AAD_TENANT_ID": "tenant-id",
+        "AAD_REDIRECT_URI": "http://localhost/auth/callback",
+        "BLOG_API_URL": "http://127.0.0.1:9/",
+        "PUSH_VAPID_PUBLIC_KEY": "public-key",
+        "PUSH_VAPID_PRIVATE_KEY": "private-key",
+        "PUSH_CONTACT_EMAIL": "admin@example.com",
+        "TOKEN_ENCRYPTION_KEY": "ZmDfcTF7_60GrrY167zsiPd67pEvs0aGOv2oasOM1Pg=",
+        "APP_DATABASE_PATH": str(Path(_DATA_DIR) / "app.db"),
+    }
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A database manager on a fresh file."""
+    from app.db.database import DatabaseManager
+
+    with DatabaseManager(str(tmp_path / "test.db")) as manager:
+        yield manager
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The Flask app on a fresh database, with the identity provider and background poller stubbed out."""
+    from app.web import main
+
+    monkeypatch.setattr("app.core.config.Config.APP_DATABASE_PATH", str(tmp_path / "app.db"))
+    # setup_logging writes app.log to the working directory
+    monkeypatch.chdir(tmp_path)
+    # AuthService contacts the identity provider on construction
+    monkeypatch.setattr(main, "AuthService", mock.MagicMock())
+    monkeypatch.setattr(main.PollingService, "start", lambda _self: None)
+    flask_app = main.create_app()
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield flask_app
+    main.shutdown_services(flask_app)
+
+
+@pytest.fixture
+def signed_in(app, monkeypatch):
+    """Return a factory for test clients signed in as the given user."""
+    monkeypatch.setattr("app.core.utils.session_utils._validate_session", lambda: True)
+
+    def make_client(username: str = "user@example.com"):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user"] = {"preferred_username": username}
+        return client
+
+    return make_client
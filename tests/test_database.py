@@ -0,0 +1,60 @@
+"""tests for the database manager."""
+
+from datetime import datetime, timezone
+
+from app.db.models import Post
+
+
+def _post(title: str = "Office closed") -> Post:
+    return Post(
+        title=title,
+        content="The office is closed on Friday.",
+        publish_date=datetime(2026, 10, 14, tzinfo=timezone.utc),
+        location="Budapest",
+        department="Facilities",
+        category="News",
+    )
+
+
+def test_post_reads_ignore_extra_columns(db):
+    """A column added to posts outside the model does not break reading posts back."""
+    post = _post()
+    db.add_posts_bulk([post])
+    db._conn.execute("ALTER TABLE posts ADD COLUMN source TEXT DEFAULT 'blog'")
+
+    assert db.get_post(post.id).title == post.title
+    assert [latest.id for latest in db.get_latest_posts()] == [post.id]
+
+
+SUBSCRIPTION = {"endpoint": "https://push.example.com/send/abc123", "keys": {"p256dh": "key", "auth": "secret"}}
+
+
+def test_subscription_cache_is_off_by_default(db):
+    """Without a cache TTL every lookup sees rows removed by other processes."""
+    db.add_push_subscription(SUBSCRIPTION, "user@example.com")
+    assert db.push_subscription_exists(SUBSCRIPTION["endpoint"], "user@example.com")
+
+    # Another worker process deletes the row behind this manager's back
+    db._conn.execute("DELETE FROM push_subscriptions")
+
+    assert not db.push_subscription_exists(SUBSCRIPTION["endpoint"], "user@example.com")
+
+
+def test_removed_subscription_is_forgotten(db, monkeypatch):
+    """With the cache enabled, removing a subscription drops it from the cache too."""
+    monkeypatch.setattr("app.core.config.Config.SUBSCRIPTION_CACHE_TTL", 300)
+    db.add_push_subscription(SUBSCRIPTION, "user@example.com")
+    assert db.push_subscription_exists(SUBSCRIPTION["endpoint"], "user@example.com")
+
+    db.remove_push_subscription(SUBSCRIPTION, user_key="user@example.com")
+
+    assert not db.push_subscription_exists(SUBSCRIPTION["endpoint"], "user@example.com")
+
+
+def test_subscribed_user_keys_are_distinct(db):
+    """Users with several devices are listed once."""
+    db.add_push_subscription(SUBSCRIPTION, "user@example.com")
+    db.add_push_subscription({**SUBSCRIPTION, "endpoint": "https://push.example.com/send/def456"}, "user@example.com")
+    db.add_push_subscription({**SUBSCRIPTION, "endpoint": "https://push.example.com/send/ghi789"}, "other@example.com")
+
+    assert sorted(db.get_subscribed_user_keys()) == ["other@example.com", "user@example.com"]
@@ -0,0 +1,60 @@
+"""tests for the HTTP client."""
+
+import io
+
+import requests
+
+from app.utils.http_client import HTTPClient
+
+BASE_URL = "https://blog.example.com"
+BODY = b"<html><body>posts</body></html>"
+
+
+def _response(status_code: int, body: bytes = b"", headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    response.url = BASE_URL
+    return response
+
+
+def test_not_modified_reuses_cached_body(monkeypatch):
+    """A 304 answer to a conditional GET returns the body of the last full response."""
+    client = HTTPClient(BASE_URL)
+    responses = [
+        _response(200, BODY, {"ETag": '"v1"', "Last-Modified": "Wed, 14 Oct 2026 10:00:00 GMT"}),
+        _response(304),
+    ]
+    sent_headers = []
+
+    def fake_get(_url, headers=None, **_kwargs):
+        sent_headers.append(headers or {})
+        return responses.pop(0)
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+
+    assert client.get() == BODY
+    assert client.get() == BODY
+    assert "If-None-Match" not in sent_headers[0]
+    assert sent_headers[1]["If-None-Match"] == '"v1"'
+    assert sent_headers[1]["If-Modified-Since"] == "Wed, 14 Oct 2026 10:00:00 GMT"
+    client.close()
+
+
+def test_responses_without_validators_are_not_revalidated(monkeypatch):
+    """Without an ETag or Last-Modified there is nothing to revalidate against."""
+    client = HTTPClient(BASE_URL)
+    sent_headers = []
+
+    def fake_get(_url, headers=None, **_kwargs):
+        sent_headers.append(headers or {})
+        return _response(200, BODY)
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+
+    client.get()
+    client.get()
+    assert "If-None-Match" not in sent_headers[1]
+    assert "If-Modified-Since" not in sent_headers[1]
+    client.close()
@@ -0,0 +1,29 @@
+"""tests for notification dispatch."""
+
+import logging
+from datetime import datetime, timezone
+
+from app.db.models import Post
+from app.services.notification import NotificationService
+
+
+def test_unexpected_dispatch_errors_are_logged(db, caplog):
+    """An error escaping the dispatch thread is logged instead of vanishing with its future."""
+    db.update_notification_settings("user@example.com", {"locationFilter": None})
+    post = Post(
+        title="Office closed",
+        content="The office is closed on Friday.",
+        publish_date=datetime(2026, 10, 14, tzinfo=timezone.utc),
+        location="Budapest",
+        department="Facilities",
+        category="News",
+    )
+    db.add_posts_bulk([post])
+    notifier = NotificationService(db)
+
+    with caplog.at_level(logging.ERROR, logger="app.services.notification"):
+        notifier.create_bulk_notification([post])
+        # Waits for the queued dispatch and its done-callback
+        notifier.close()
+
+    assert "Notification dispatch failed" in caplog.text
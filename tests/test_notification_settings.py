@@ -0,0 +1,74 @@
+"""tests for notification settings caching."""
+
+import pytest
+
+from app.db.database import DatabaseError
+from app.services.notification import NotificationService
+
+
+@pytest.fixture
+def notifier(db, monkeypatch):
+    """A notification service on a fresh database, with the settings cache enabled."""
+    monkeypatch.setattr("app.core.config.Config.SETTINGS_CACHE_TTL", 60)
+    service = NotificationService(db)
+    yield service
+    service.close()
+
+
+def test_update_invalidates_cached_settings(notifier):
+    """Settings read after an update reflect it, even within the cache TTL."""
+    user_key = "user@example.com"
+    settings = notifier.get_settings(user_key)
+    assert settings["language"] == "en"
+
+    assert notifier.update_settings(user_key, {**settings, "language": "hu", "updateInterval": 15})
+
+    updated = notifier.get_settings(user_key)
+    assert updated["language"] == "hu"
+    assert updated["updateInterval"] == 15
+
+
+def test_failed_update_still_invalidates(notifier, monkeypatch):
+    """Keywords are written before the settings, so a failing settings write still drops the cache."""
+    user_key = "user@example.com"
+    assert notifier.update_settings(user_key, notifier.get_settings(user_key))
+    settings = notifier.get_settings(user_key)
+
+    def fail(*_args):
+        raise DatabaseError("database is locked")
+
+    monkeypatch.setattr(notifier.db, "update_notification_settings", fail)
+    with pytest.raises(DatabaseError):
+        notifier.update_settings(user_key, {**settings, "keywords": ["parking"]})
+
+    assert notifier.get_settings(user_key)["keywords"] == ["parking"]
+
+
+def test_cached_settings_are_copies(notifier):
+    """Mutating returned settings does not leak into later reads."""
+    user_key = "user@example.com"
+    notifier.get_settings(user_key)["locationFilter"]["locations"].append("Budapest")
+
+    assert notifier.get_settings(user_key)["locationFilter"]["locations"] == []
+
+
+def test_load_racing_with_invalidation_is_not_cached(notifier, monkeypatch):
+    """Settings loaded while an update lands are returned but not stored."""
+    user_key = "user@example.com"
+    read_settings = notifier.db.get_notification_settings
+    reads = []
+
+    def read_then_invalidate(key):
+        reads.append(key)
+        stored = read_settings(key)
+        if len(reads) == 1:
+            notifier.invalidate(key)
+        return stored
+
+    monkeypatch.setattr(notifier.db, "get_notification_settings", read_then_invalidate)
+    notifier.get_settings(user_key)
+    notifier.get_settings(user_key)
+    notifier.get_settings(user_key)
+
+    # The first, raced load was discarded; the second one was cached for the third call
+    assert reads == [user_key, user_key]
@@ -0,0 +1,27 @@
+"""tests for the blog content parser."""
+
+from datetime import datetime, timezone
+
+from app.services import parser
+
+
+def test_fixed_format_dates_are_parsed_once():
+    """Dates in a known format are memoized across polls."""
+    parser._parse_fixed_format.cache_clear()
+
+    first = parser._parse_date_string("January 5, 2026")
+    second = parser._parse_date_string("January 5, 2026")
+
+    assert first == second == datetime(2026, 1, 5, tzinfo=timezone.utc)
+    assert parser._parse_fixed_format.cache_info().hits == 1
+
+
+def test_relative_dates_are_not_memoized(monkeypatch):
+    """Fuzzy dates depend on the current day, so each poll parses them again."""
+    days = iter(
+        (datetime(2026, 10, 14, 10, 30, tzinfo=timezone.utc), datetime(2026, 10, 15, 10, 30, tzinfo=timezone.utc))
+    )
+    monkeypatch.setattr(parser.date_parser, "parse", lambda *_args, **_kwargs: next(days))
+
+    assert parser._parse_date_string("10:30") == datetime(2026, 10, 14, 10, 30, tzinfo=timezone.utc)
+    assert parser._parse_date_string("10:30") == datetime(2026, 10, 15, 10, 30, tzinfo=timezone.utc)
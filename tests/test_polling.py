@@ -0,0 +1,35 @@
+"""tests for the polling service."""
+
+import logging
+from datetime import datetime, timezone
+from unittest import mock
+
+from app.db.database import DatabaseError
+from app.db.models import Post
+from app.services.polling import PollingService
+
+
+def test_notification_write_failure_is_reported(db, caplog):
+    """Posts stored without their notifications are named in the log and recorded as the last error."""
+    post = Post(
+        title="Office closed",
+        content="The office is closed on Friday.",
+        publish_date=datetime(2026, 10, 14, tzinfo=timezone.utc),
+        location="Budapest",
+        department="Facilities",
+        category="News",
+    )
+    client = mock.Mock()
+    client.get_content.return_value = b"<html></html>"
+    parser = mock.Mock()
+    parser.parse_html_content.return_value = [post]
+    notifier = mock.Mock()
+    notifier.create_bulk_notification.side_effect = DatabaseError("disk I/O error")
+    poller = PollingService("https://blog.example.com", db, client, parser, notifier)
+
+    with caplog.at_level(logging.ERROR, logger="app.services.polling"):
+        poller._poll_job()
+
+    assert f"Notifications lost for 1 stored posts: {post.id}" in caplog.text
+    assert poller._last_error == "disk I/O error"
+    assert db.get_post(post.id) is not None
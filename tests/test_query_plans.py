@@ -0,0 +1,42 @@
+"""tests that the hot read queries stay on their indexes."""
+
+import pytest
+
+USER = "user@example.com"
+
+
+@pytest.mark.parametrize(
+    ("read", "index"),
+    [
+        (lambda db: db.get_user_notification_count(USER), "COVERING INDEX idx_user_notifications_uid_read_nid"),
+        (lambda db: db.get_user_notification_counts(USER), "COVERING INDEX idx_user_notifications_uid_read_nid"),
+        (lambda db: db.get_user_notifications(USER), "idx_user_notifications_uid_read_nid"),
+        (lambda db: db.get_notifications(USER), "idx_user_notifications_uid_read_nid"),
+        (lambda db: db.get_latest_posts(), "idx_posts_publish"),
+        (lambda db: db.get_recent_post_fingerprints(), "idx_posts_created"),
+        (lambda db: db.push_subscription_exists("https://push.example.com/send/abc", USER), "(endpoint=?)"),
+        (lambda db: list(db.iter_eligible_push_subscriptions([USER])), "idx_push_subscriptions_user_device"),
+    ],
+    ids=[
+        "notification_count",
+        "notification_counts",
+        "user_notifications",
+        "notifications",
+        "latest_posts",
+        "post_fingerprints",
+        "subscription_exists",
+        "eligible_subscriptions",
+    ],
+)
+def test_hot_reads_use_their_index(db, monkeypatch, read, index):
+    """Each hot read is planned on the expected index and never falls back to a full table scan."""
+    statements = []
+    monkeypatch.setattr("app.core.config.Config.DB_EXPLAIN_QUERIES", True)
+    monkeypatch.setattr(db, "_explain", lambda sql, params: statements.append((sql, params)))
+
+    read(db)
+
+    assert statements
+    plan = [detail for sql, params in statements for detail in db._query_plan(sql, params)]
+    assert any(index in detail for detail in plan), plan
+    assert not [detail for detail in plan if detail.startswith("SCAN") and "INDEX" not in detail], plan
@@ -0,0 +1,80 @@
+"""tests for the push subscription endpoints."""
+
+import threading
+import time
+
+import pytest
+
+SUBSCRIPTION = {
+    "endpoint": "https://push.example.com/send/abc123",
+    "keys": {"p256dh": "p256dh-key", "auth": "auth-secret"},
+}
+
+
+def test_concurrent_duplicate_posts_insert_once(app, signed_in):
+    """A subscription posted twice at once is stored by the first request only."""
+    db = app.database_manager
+    original_add = db.add_push_subscription
+    inserts = []
+    first_insert_started = threading.Event()
+
+    def slow_add(*args, **kwargs):
+        inserts.append(args)
+        first_insert_started.set()
+        # Keep the first request in flight while the duplicate arrives
+        time.sleep(0.2)
+        return original_add(*args, **kwargs)
+
+    db.add_push_subscription = slow_add
+    statuses = []
+
+    def post_subscription():
+        statuses.append(signed_in().post("/api/subscriptions", json=SUBSCRIPTION).status_code)
+
+    first = threading.Thread(target=post_subscription)
+    first.start()
+    assert first_insert_started.wait(timeout=5)
+    second = threading.Thread(target=post_subscription)
+    second.start()
+    first.join()
+    second.join()
+
+    assert len(inserts) == 1
+    assert sorted(statuses) == [200, 201]
+    assert db.push_subscription_exists(SUBSCRIPTION["endpoint"], "user@example.com")
+
+
+@pytest.mark.parametrize(
+    "endpoint",
+    [
+        "http://push.example.com/send/abc123",
+        "https://push.example.com/send/abc 123",
+        "https://push.example.com/send/abc123\n",
+        "javascript:alert(1)",
+    ],
+)
+def test_post_rejects_malformed_endpoints(app, signed_in, endpoint):
+    """New subscriptions must carry a plain HTTPS endpoint URL."""
+    response = signed_in().post("/api/subscriptions", json={**SUBSCRIPTION, "endpoint": endpoint})
+
+    assert response.status_code == 400
+    assert not app.database_manager.push_subscription_exists(endpoint, "user@example.com")
+
+
+def test_delete_accepts_endpoints_rejected_on_post(app, signed_in):
+    """Removal only needs an endpoint, so subscriptions stored before stricter checks can be deleted."""
+    endpoint = "http://push.example.com/send/legacy"
+    app.database_manager.add_push_subscription({**SUBSCRIPTION, "endpoint": endpoint}, "user@example.com")
+
+    response = signed_in().delete("/api/subscriptions", json={"endpoint": endpoint})
+
+    assert response.status_code == 200
+    assert not app.database_manager.push_subscription_exists(endpoint, "user@example.com")
+
+
+@pytest.mark.parametrize("body", [{"endpoint": ""}, {"endpoint": 42}, {"keys": SUBSCRIPTION["keys"]}])
+def test_delete_requires_an_endpoint(signed_in, body):
+    """Removal still rejects bodies without a usable endpoint."""
+    response = signed_in().delete("/api/subscriptions", json=body)
+
+    assert response.status_code == 400
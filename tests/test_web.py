@@ -0,0 +1,14 @@
+"""tests for the web app's own routes."""
+
+
+def test_notify_is_never_cached(app, signed_in):
+    """Every test push request reaches the server; a cached "Notification sent" would be false."""
+    sent = []
+    app.notification_service.create_test_notification = lambda: sent.append(1) or True
+    client = signed_in()
+
+    responses = [client.get("/notify") for _ in range(2)]
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert all(response.headers["Cache-Control"] == "no-store" for response in responses)
+    assert len(sent) == 2